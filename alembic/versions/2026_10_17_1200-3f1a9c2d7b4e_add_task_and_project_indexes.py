@@ -0,0 +1,58 @@
+"""Add composite indexes for task and project access paths
+
+Revision ID: 3f1a9c2d7b4e
+Revises: 9c8d7e6f5g4h
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a9c2d7b4e"
+down_revision: Union[str, Sequence[str], None] = "9c8d7e6f5g4h"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: build indexes concurrently (outside a transaction)."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_id_id", "tasks", ["project_id", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_project_id_deadline_id", "tasks", ["project_id", "deadline", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_project_id_created_at_id", "tasks", ["project_id", "created_at", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_open_project_id_deadline", "tasks", ["project_id", "deadline"],
+            postgresql_where=sa.text("status <> 'completed'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_projects_user_id_id", "projects", ["user_id", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop the indexes concurrently."""
+    with op.get_context().autocommit_block():
+        for table, name in (
+            ("projects", "ix_projects_user_id_id"),
+            ("tasks", "ix_tasks_open_project_id_deadline"),
+            ("tasks", "ix_tasks_project_id_created_at_id"),
+            ("tasks", "ix_tasks_project_id_deadline_id"),
+            ("tasks", "ix_tasks_project_id_id"),
+        ):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
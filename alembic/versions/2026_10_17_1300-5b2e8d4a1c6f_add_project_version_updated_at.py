@@ -0,0 +1,42 @@
+"""Add version and updated_at to projects
+
+Revision ID: 5b2e8d4a1c6f
+Revises: 3f1a9c2d7b4e
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e8d4a1c6f"
+down_revision: Union[str, Sequence[str], None] = "3f1a9c2d7b4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: add projects.version and projects.updated_at."""
+    op.add_column(
+        "projects",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop projects.version and projects.updated_at."""
+    op.drop_column("projects", "version")
+    op.drop_column("projects", "updated_at")
@@ -0,0 +1,49 @@
+"""Add indexes for task filtering and priority sorting
+
+Revision ID: 7d3c1e9f2a5b
+Revises: 5b2e8d4a1c6f
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3c1e9f2a5b"
+down_revision: Union[str, Sequence[str], None] = "5b2e8d4a1c6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must stay identical to app.models.task.priority_rank_sql()
+PRIORITY_RANK = (
+    "(CASE WHEN priority = 'urgent' THEN 0 WHEN priority = 'high' THEN 1 "
+    "WHEN priority = 'normal' THEN 2 WHEN priority = 'low' THEN 3 ELSE 4 END)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema: build filter/sort indexes concurrently."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_project_id_status_id", "tasks", ["project_id", "status", "id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_tasks_project_id_priority_rank_id", "tasks",
+            [sa.text("project_id"), sa.text(PRIORITY_RANK), sa.text("id")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop filter/sort indexes."""
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_tasks_project_id_priority_rank_id",
+            "ix_tasks_project_id_status_id",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True, if_exists=True)
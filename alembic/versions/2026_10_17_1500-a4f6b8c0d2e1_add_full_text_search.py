@@ -0,0 +1,74 @@
+"""Add full-text search vectors to tasks and projects
+
+Adding a STORED generated column rewrites the whole table under an ACCESS
+EXCLUSIVE lock: reads and writes of tasks and projects block until the
+rewrite finishes, so run it in a maintenance window on large databases.
+`lock_timeout` makes the migration fail fast instead of waiting behind a
+long transaction while every later query waits behind the migration.
+
+Revision ID: a4f6b8c0d2e1
+Revises: 7d3c1e9f2a5b
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f6b8c0d2e1"
+down_revision: Union[str, Sequence[str], None] = "7d3c1e9f2a5b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: generated tsvector columns plus GIN indexes."""
+    # adding a stored generated column rewrites the table (see the module docstring)
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "projects",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_search_vector", "tasks", ["search_vector"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_projects_search_vector", "projects", ["search_vector"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop search indexes and columns."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_projects_search_vector", table_name="projects", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_tasks_search_vector", table_name="tasks", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("projects", "search_vector")
+    op.drop_column("tasks", "search_vector")
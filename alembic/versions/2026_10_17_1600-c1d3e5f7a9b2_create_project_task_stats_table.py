@@ -0,0 +1,47 @@
+"""Create project_task_stats table
+
+Revision ID: c1d3e5f7a9b2
+Revises: a4f6b8c0d2e1
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1d3e5f7a9b2"
+down_revision: Union[str, Sequence[str], None] = "a4f6b8c0d2e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema: create project_task_stats table."""
+    op.create_table(
+        "project_task_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("done", sa.Integer(), nullable=False),
+        sa.Column("urgent", sa.Integer(), nullable=False),
+        sa.Column("high", sa.Integer(), nullable=False),
+        sa.Column("normal", sa.Integer(), nullable=False),
+        sa.Column("low", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["project_id"], ["projects.id"],
+            name=op.f("fk_project_task_stats_project_id_projects"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_project_task_stats")),
+        sa.UniqueConstraint("project_id", name=op.f("uq_project_task_stats_project_id")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema: drop project_task_stats table."""
+    op.drop_table("project_task_stats")
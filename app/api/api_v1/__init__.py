@@ -1,12 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.api.api_v1.users import router as users_router
 from app.api.api_v1.projects import router as project_router
 from app.api.api_v1.auth import router as auth_router
 from app.api.api_v1.tasks import router as tasks_router
+from app.api.api_v1.export import router as export_router
+from app.api.api_v1.search import router as search_router
+from app.api.api_v1.rate_limit import enforce_rate_limit
 
-router = APIRouter(prefix="/v1")
+router = APIRouter(prefix="/v1", dependencies=[Depends(enforce_rate_limit)])
 
 router.include_router(users_router)
 router.include_router(project_router)
 router.include_router(tasks_router)
-router.include_router(auth_router)
\ No newline at end of file
+router.include_router(auth_router)
+router.include_router(export_router)
+router.include_router(search_router)
\ No newline at end of file
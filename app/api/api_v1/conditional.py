@@ -0,0 +1,29 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag built from cheap version data, never from the response body."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def params_digest(*params) -> str:
+    """Short digest of query parameters, so every page/sort has its own ETag."""
+    raw = "|".join(str(param) for param in params).encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = (candidate.strip().removeprefix("W/") for candidate in header.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -2,13 +2,16 @@ from pydantic import BaseModel
 from fastapi import Depends, HTTPException, status, Form, Request
 from jwt import InvalidTokenError
 from app.schemas.user import UserRead
-from app.auth import utils as auth
+from app.auth.hashing import password_hasher
 from app.auth.utils import decode_jwt
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import db_helper
-from app.api.api_v1.crud.users import get_user_by_email
+from app.api.api_v1.crud.users import get_user_by_email, get_user_by_id
+from app.auth.user_cache import user_state_cache
+from app.core.config import settings
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -24,21 +27,43 @@ async def validate_auth_user(
     password: str = Form(),
 ) -> UserRead:
     """Validate credentials against the database and return a `UserRead` schema on success."""
-    user = await get_user_by_email(session, email)
-    unaouthorized_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid email or password",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    if not user:
-        raise unaouthorized_exception
-    if not auth.validate_password(password, user.hashed_password):
-        raise unaouthorized_exception
-    return UserRead.model_validate(user)
+    user = await authenticate_user(session, email, password)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+def decode_request_token(request: Request, token: str) -> dict:
+    """decode_jwt once per request: the rate limiter and the auth dependencies share the result"""
+    cached = getattr(request.state, "token_payload", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    payload = decode_jwt(token=token)
+    request.state.token_payload = (token, payload)
+    return payload
+
+
+def get_optional_token_payload(request: Request) -> dict | None:
+    """Claims of a valid bearer token, or None for anonymous requests and invalid tokens.
 
-def get_current_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    Reads the header directly instead of through a security scheme, so routes
+    using it aren't documented as requiring auth.
+    """
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return None
     try:
-        decoded_token = decode_jwt(token=token)
+        return decode_request_token(request, token)
+    except InvalidTokenError:
+        return None
+
+
+def get_current_token_payload(request: Request, token: str = Depends(oauth2_scheme)) -> dict:
+    try:
+        decoded_token = decode_request_token(request, token)
     except InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,10 +73,36 @@ def get_current_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
     return decoded_token
 
 
+async def get_stateless_auth_user(session: AsyncSession, payload: dict) -> UserRead:
+    """Build `UserRead` from verified token claims; the DB is only hit on a cache miss."""
+    sub, email, name = payload.get("sub"), payload.get("email"), payload.get("name")
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if not sub or not email or name is None:
+        raise credentials_exception
+    try:
+        user_id = int(sub)
+    except ValueError:
+        raise credentials_exception
+    active = user_state_cache.get(sub)
+    if active is None:
+        active = await get_user_by_id(session, user_id) is not None
+        user_state_cache.set(sub, active)
+    if not active:
+        raise credentials_exception
+    # claims were signed by us, so skip re-validating them
+    return UserRead.model_construct(id=user_id, email=email, name=name)
+
+
 async def get_current_auth_user(
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
     payload: dict = Depends(get_current_token_payload),
 ) -> UserRead:
+    if settings.auth_jwt.stateless:
+        return await get_stateless_auth_user(session, payload)
     email: str | None = payload.get("email")
     if not email:
         raise HTTPException(
@@ -70,13 +121,19 @@ async def get_current_auth_user(
 
 
 async def authenticate_user(session: AsyncSession, email: str, password: str) -> UserRead | None:
-    """Return authenticated user as `UserRead` or None."""
+    """Return authenticated user as `UserRead` or None.
+
+    The read transaction ends before bcrypt runs, so a burst of logins
+    doesn't hold every pooled connection while waiting for hash threads.
+    """
     user = await get_user_by_email(session, email)
     if not user:
         return None
-    if not auth.validate_password(password, user.hashed_password):
+    user_read, hashed_password = UserRead.model_validate(user), user.hashed_password
+    await session.rollback()
+    if not await password_hasher.verify(password, hashed_password):
         return None
-    return UserRead.model_validate(user)
+    return user_read
 
 
 async def get_login_credentials(request: Request, email: str | None = Form(None), password: str | None = Form(None)) -> dict:
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Project, Task
+
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = (
+    "type",
+    "id",
+    "project_id",
+    "name",
+    "description",
+    "status",
+    "priority",
+    "deadline",
+    "created_at",
+    "updated_at",
+    "completed_at",
+)
+
+PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.created_at,
+)
+
+TASK_COLUMNS = (
+    Task.id,
+    Task.project_id,
+    Task.title.label("name"),
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.deadline,
+    Task.created_at,
+    Task.updated_at,
+    Task.completed_at,
+)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _records(kind: str, rows) -> list[dict]:
+    return [{"type": kind, **row._mapping} for row in rows]
+
+
+def _to_ndjson(records: list[dict]) -> str:
+    return "".join(json.dumps(record, default=_json_default) + "\n" for record in records)
+
+
+def _to_csv(records: list[dict], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    for record in records:
+        writer.writerow(
+            {k: v.isoformat() if isinstance(v, datetime) else v for k, v in record.items()}
+        )
+    return buffer.getvalue()
+
+
+async def stream_user_export(
+    session_factory: async_sessionmaker, user_id: int, fmt: str = "ndjson"
+) -> AsyncIterator[str]:
+    """Стримить проекты и задачи пользователя через серверный курсор.
+
+    Строки читаются пачками по `EXPORT_BATCH_SIZE` и сразу отдаются
+    клиенту, поэтому память не зависит от объёма данных. Сессия открывается
+    внутри генератора, так как он живёт дольше обработчика запроса.
+    """
+    encode = _to_csv if fmt == "csv" else _to_ndjson
+    if fmt == "csv":
+        yield _to_csv([], header=True)
+    async with session_factory() as session:
+        projects = select(*PROJECT_COLUMNS).where(Project.user_id == user_id).order_by(Project.id)
+        tasks = (
+            select(*TASK_COLUMNS)
+            .join(Project, Project.id == Task.project_id)
+            .where(Project.user_id == user_id)
+            .order_by(Task.project_id, Task.id)
+        )
+        for kind, stmt in (("project", projects), ("task", tasks)):
+            result = await session.stream(
+                stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                yield encode(_records(kind, partition))
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort: str, value, last_id: int) -> str:
+    """Pack the sort key of the last returned row into an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps({"s": sort, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _sort_value(sort: str, value):
+    """Check a decoded sort value against the sort it claims and restore its type."""
+    if sort in ("id", "priority"):
+        # ids and priority ranks; bool is an int subclass but never a valid value
+        if type(value) is not int:
+            raise ValueError(f"{sort} value must be an integer")
+        return value
+    if value is None and sort == "deadline":
+        # NULL deadlines sort last
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{sort} value must be an ISO 8601 timestamp")
+    return datetime.fromisoformat(value)
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """Return `(value, last_id)` from a cursor produced by `encode_cursor`.
+
+    The value comes back typed for `sort` (datetimes are parsed), so
+    anything a client could have tampered with is rejected here with 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != sort:
+            raise ValueError("cursor was issued for another sort order")
+        if type(data["id"]) is not int:
+            raise ValueError("id must be an integer")
+        return _sort_value(sort, data["v"]), data["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {e}"
+        )
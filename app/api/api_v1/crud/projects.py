@@ -1,32 +1,114 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete, func
 from typing import Sequence
-from app.models import Project
-from app.schemas.project import ProjectCreate
+from app.models import Project, Task
+from app.schemas.project import ProjectCreate, ProjectRead, ProjectTaskCounts, ProjectWithTasks
+from app.schemas.task import TaskRead
+from app.api.api_v1.crud.tasks import COMPLETED, TASK_READ_COLUMNS, priority_rank
+from app.core.cache import response_cache, projects_scope, tasks_scope
 
 
-async def get_all_projects(session: AsyncSession, user_id: int) -> Sequence[Project]:
-    """Получить все проекты пользователя"""
+PROJECT_READ_COLUMNS = (Project.id, Project.name, Project.description)
+
+
+async def get_all_projects(session: AsyncSession, user_id: int, columns: bool = False) -> Sequence:
+    """Получить все проекты пользователя (строки `PROJECT_READ_COLUMNS` при columns=True)"""
+    if columns:
+        stmt = select(*PROJECT_READ_COLUMNS).where(Project.user_id == user_id).order_by(Project.id)
+        return (await session.execute(stmt)).all()
     stmt = select(Project).where(Project.user_id == user_id).order_by(Project.id)
     result = await session.scalars(stmt)
     return result.all()
 
 
-async def create_project(session: AsyncSession, project_create: ProjectCreate, user_id: int) -> Project:
-    project = Project(**project_create.model_dump(), user_id=user_id)
-    session.add(project)
+async def get_projects_with_task_counts(session: AsyncSession, user_id: int) -> list[ProjectTaskCounts]:
+    """Проекты пользователя со счётчиками задач — один GROUP BY вместо запроса на проект"""
+    stmt = (
+        select(
+            *PROJECT_READ_COLUMNS,
+            func.count(Task.id).label("task_count"),
+            func.count(Task.id).filter(Task.status != COMPLETED).label("open_task_count"),
+        )
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .where(Project.user_id == user_id)
+        .group_by(Project.id)
+        .order_by(Project.id)
+    )
+    return [ProjectTaskCounts.model_validate(row) for row in (await session.execute(stmt)).all()]
+
+
+async def get_projects_with_tasks(session: AsyncSession, user_id: int, limit: int) -> list[ProjectWithTasks]:
+    """Проекты пользователя и до `limit` открытых задач каждого (приоритет, дедлайн, id).
+
+    Задачи берутся одним оконным запросом (ROW_NUMBER() по project_id), а не через
+    `Project.tasks`: selectinload загрузил бы все задачи проекта без ограничения.
+    """
+    projects = await get_all_projects(session=session, user_id=user_id, columns=True)
+    if not projects:
+        return []
+    window = {
+        "partition_by": Task.project_id,
+        "order_by": (priority_rank, Task.deadline.asc().nulls_last(), Task.id),
+    }
+    ranked = (
+        select(
+            Task.project_id,
+            *TASK_READ_COLUMNS,
+            func.row_number().over(**window).label("position"),
+            func.count().over(partition_by=Task.project_id).label("open_task_count"),
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(Project.user_id == user_id, Task.status != COMPLETED)
+        .subquery()
+    )
+    stmt = select(ranked).where(ranked.c.position <= limit).order_by(ranked.c.project_id, ranked.c.position)
+    tasks: dict[int, list[TaskRead]] = {}
+    open_counts: dict[int, int] = {}
+    for row in (await session.execute(stmt)).all():
+        tasks.setdefault(row.project_id, []).append(TaskRead.model_validate(row))
+        open_counts[row.project_id] = row.open_task_count
+    return [
+        ProjectWithTasks(
+            id=project.id,
+            name=project.name,
+            description=project.description,
+            open_task_count=open_counts.get(project.id, 0),
+            tasks=tasks.get(project.id, []),
+        )
+        for project in projects
+    ]
+
+
+async def create_project(session: AsyncSession, project_create: ProjectCreate, user_id: int) -> ProjectRead:
+    """Создать проект одним INSERT ... RETURNING"""
+    stmt = (
+        insert(Project)
+        .values(**project_create.model_dump(), user_id=user_id)
+        .returning(*PROJECT_READ_COLUMNS)
+    )
+    row = (await session.execute(stmt)).one()
     await session.commit()
-    await session.refresh(project)
-    return project
+    await response_cache.invalidate(projects_scope(user_id))
+    return ProjectRead.model_validate(row)
 
-async def delete_project(session: AsyncSession, project_id: int, user_id: int) -> Project | None:
-    stmt = select(Project).where(Project.id == project_id, Project.user_id == user_id)
-    result = await session.scalars(stmt)
-    project = result.first()
-    if project:
-        await session.delete(project)
-        await session.commit()
-    return project
+
+async def delete_project(session: AsyncSession, project_id: int, user_id: int) -> int | None:
+    """Удалить проект вместе с задачами одним запросом (DELETE ... RETURNING id)"""
+    owned = select(Project.id).where(Project.id == project_id, Project.user_id == user_id).exists()
+    deleted_tasks = delete(Task).where(Task.project_id == project_id, owned).cte("deleted_tasks")
+    stmt = (
+        delete(Project)
+        .where(Project.id == project_id, Project.user_id == user_id)
+        .add_cte(deleted_tasks)
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id = await session.scalar(stmt)
+    await session.commit()
+    if deleted_id is not None:
+        await response_cache.invalidate(projects_scope(user_id), tasks_scope(project_id))
+    return deleted_id
 
 
 async def get_project_by_id(session: AsyncSession, project_id: int, user_id: int) -> Project | None:
@@ -34,3 +116,24 @@ async def get_project_by_id(session: AsyncSession, project_id: int, user_id: int
     stmt = select(Project).where(Project.id == project_id, Project.user_id == user_id)
     result = await session.scalars(stmt)
     return result.first()
+
+
+async def get_projects_version(session: AsyncSession, user_id: int) -> tuple[int, int, int]:
+    """count, sum(version) и max(id) проектов пользователя — дешёвая основа для ETag.
+
+    Любая запись в задачи увеличивает version проекта, удаление уменьшает
+    count, а новый проект получает id больше всех прежних, так что тройка
+    меняется при любом изменении. max(updated_at) для этого не годится:
+    now() — время начала транзакции, и поздно закоммиченная запись его не сдвигает.
+    """
+    stmt = select(
+        func.count(Project.id), func.coalesce(func.sum(Project.version), 0), func.coalesce(func.max(Project.id), 0)
+    ).where(Project.user_id == user_id)
+    count, versions, last_id = (await session.execute(stmt)).one()
+    return count, versions, last_id
+
+
+async def get_project_version(session: AsyncSession, project_id: int, user_id: int) -> int | None:
+    """Версия проекта с проверкой прав доступа; None, если проект не найден или чужой"""
+    stmt = select(Project.version).where(Project.id == project_id, Project.user_id == user_id)
+    return await session.scalar(stmt)
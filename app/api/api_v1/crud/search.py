@@ -0,0 +1,55 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Project, Task
+
+
+# must match the configuration of the generated search_vector columns
+SEARCH_CONFIG = "simple"
+
+
+def _query(q: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+async def search_tasks(
+    session: AsyncSession, user_id: int, q: str, limit: int, offset: int = 0
+) -> list:
+    """Полнотекстовый поиск по задачам пользователя, по убыванию релевантности"""
+    query = _query(q)
+    rank = func.ts_rank_cd(Task.search_vector, query).label("rank")
+    stmt = (
+        select(
+            Task.id,
+            Task.project_id,
+            Task.title,
+            Task.description,
+            Task.status,
+            Task.priority,
+            Task.deadline,
+            Task.completed_at,
+            rank,
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(Task.search_vector.op("@@")(query), Project.user_id == user_id)
+        .order_by(rank.desc(), Task.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def search_projects(
+    session: AsyncSession, user_id: int, q: str, limit: int, offset: int = 0
+) -> list:
+    """Полнотекстовый поиск по проектам пользователя, по убыванию релевантности"""
+    query = _query(q)
+    rank = func.ts_rank_cd(Project.search_vector, query).label("rank")
+    stmt = (
+        select(Project.id, Project.name, Project.description, rank)
+        .where(Project.search_vector.op("@@")(query), Project.user_id == user_id)
+        .order_by(rank.desc(), Project.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return (await session.execute(stmt)).all()
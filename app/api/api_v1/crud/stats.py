@@ -0,0 +1,91 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.api_v1.crud.tasks import COMPLETED, stats_columns, stats_upsert
+from app.core.config import settings
+from app.models import Project, ProjectTaskStats, Task
+from app.models.task import PRIORITY_ORDER
+from app.schemas.project import ProjectStats
+
+
+def _overdue():
+    return func.count(Task.id).filter(Task.deadline < func.now(), Task.status != COMPLETED)
+
+
+async def _live_stats(session: AsyncSession, user_id: int) -> list:
+    """Один GROUP BY с FILTER по всем проектам пользователя"""
+    stmt = (
+        select(Project.id.label("project_id"), *stats_columns(), _overdue().label("overdue"))
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .where(Project.user_id == user_id)
+        .group_by(Project.id)
+        .order_by(Project.id)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def _counter_stats(session: AsyncSession, user_id: int) -> list:
+    """Счётчики из project_task_stats; overdue зависит от времени и считается по частичному индексу"""
+    overdue = (
+        select(_overdue())
+        .where(Task.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Project.id.label("project_id"),
+            func.coalesce(ProjectTaskStats.total, 0).label("total"),
+            func.coalesce(ProjectTaskStats.done, 0).label("done"),
+            *(
+                func.coalesce(getattr(ProjectTaskStats, value), 0).label(value)
+                for value in PRIORITY_ORDER
+            ),
+            overdue.label("overdue"),
+        )
+        .select_from(Project)
+        .outerjoin(ProjectTaskStats, ProjectTaskStats.project_id == Project.id)
+        .where(Project.user_id == user_id)
+        .order_by(Project.id)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def get_projects_stats(session: AsyncSession, user_id: int) -> list[ProjectStats]:
+    """Статистика задач по всем проектам пользователя одним запросом"""
+    if settings.stats.counters_table:
+        rows = await _counter_stats(session, user_id)
+    else:
+        rows = await _live_stats(session, user_id)
+    return [
+        ProjectStats(
+            project_id=row.project_id,
+            total=row.total,
+            done=row.done,
+            overdue=row.overdue,
+            by_priority={value: getattr(row, value) for value in PRIORITY_ORDER},
+        )
+        for row in rows
+    ]
+
+
+async def rebuild_project_stats(session: AsyncSession, project_ids: list[int] | None = None) -> int:
+    """Пересчитать project_task_stats полным агрегатом; возвращает число проектов.
+
+    Записи задач поддерживают счётчики приращениями, так что пересчёт нужен
+    только при включении счётчиков на существующей базе и для починки
+    (`python -m app.rebuild_stats`). Запись, закоммиченная во время
+    пересчёта, может в нём потеряться — запускать, когда записей нет.
+    """
+    source = (
+        select(Project.id, *stats_columns(), func.now())
+        .select_from(Project)
+        .outerjoin(Task, Task.project_id == Project.id)
+        .group_by(Project.id)
+    )
+    if project_ids:
+        source = source.where(Project.id.in_(project_ids))
+    result = await session.execute(stats_upsert(source, add=False))
+    await session.commit()
+    return result.rowcount
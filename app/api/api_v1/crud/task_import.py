@@ -0,0 +1,179 @@
+import codecs
+import csv
+import json
+from collections import Counter
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache, tasks_scope
+from app.models import Task
+from app.api.api_v1.crud.tasks import add_stats_delta, bump_project_version
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportResult
+
+
+IMPORT_CHUNK_SIZE = 1000
+# stop collecting row errors after this many, only count them
+MAX_REPORTED_ERRORS = 1000
+# longer lines are dropped unread: a valid row is far shorter, and buffering
+# a line without newlines would hold the whole upload in memory
+MAX_LINE_LENGTH = 64 * 1024
+
+COPY_COLUMNS = (
+    "user_id",
+    "project_id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "deadline",
+    "completed_at",
+    "created_at",
+    "updated_at",
+)
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[str | None]:
+    """Разбить поток байтов на строки, не буферизуя весь файл.
+
+    Вместо строки длиннее `MAX_LINE_LENGTH` отдаётся None, а сама строка
+    пропускается до ближайшего перевода строки.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    # внутри слишком длинной строки: о ней уже сообщено, ждём её конца
+    skipping = False
+    async for chunk in body:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            yield line if len(line) <= MAX_LINE_LENGTH else None
+        if len(pending) > MAX_LINE_LENGTH:
+            if not skipping:
+                yield None
+            skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield pending if len(pending) <= MAX_LINE_LENGTH else None
+
+
+async def _ndjson_rows(body: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    async for line in _lines(body):
+        if line is None:
+            yield f"Line longer than {MAX_LINE_LENGTH} characters"
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield f"Invalid JSON: {e}"
+
+
+async def _csv_rows(body: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    header: list[str] | None = None
+    record = ""
+    async for line in _lines(body):
+        if line is None or len(record) + len(line) > MAX_LINE_LENGTH:
+            record = ""
+            yield f"Record longer than {MAX_LINE_LENGTH} characters"
+            continue
+        record = f"{record}\n{line}" if record else line
+        # a quoted field may contain newlines: wait until quotes are balanced
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not any(values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield {k: v for k, v in zip(header, values) if v != ""}
+    if record:
+        yield "Unterminated quoted field"
+
+
+async def _copy_chunk(session: AsyncSession, records: list[tuple]) -> None:
+    """COPY через asyncpg; для других драйверов — многострочный INSERT"""
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    if hasattr(raw, "copy_records_to_table"):
+        await raw.copy_records_to_table(
+            Task.__tablename__, records=records, columns=COPY_COLUMNS
+        )
+    else:
+        await session.execute(
+            insert(Task), [dict(zip(COPY_COLUMNS, record)) for record in records]
+        )
+
+
+async def import_tasks(
+    session: AsyncSession,
+    body: AsyncIterator[bytes],
+    user_id: int,
+    project_id: int,
+    fmt: str = "ndjson",
+) -> TaskImportResult:
+    """Потоково импортировать задачи в проект.
+
+    Строки проверяются `TaskCreate` и загружаются пачками по
+    `IMPORT_CHUNK_SIZE`; невалидные строки попадают в отчёт и не прерывают
+    импорт. Все пачки коммитятся одной транзакцией в конце.
+    """
+    rows = _csv_rows(body) if fmt == "csv" else _ndjson_rows(body)
+    result = TaskImportResult(imported=0, failed=0, errors=[])
+    chunk: list[tuple] = []
+    stats = Counter()
+    row_number = 0
+    async for row in rows:
+        row_number += 1
+        try:
+            if isinstance(row, str):
+                raise ValueError(row)
+            task = TaskCreate.model_validate(row)
+        except (ValidationError, ValueError) as e:
+            result.failed += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                errors = e.errors(include_url=False) if isinstance(e, ValidationError) else str(e)
+                result.errors.append(TaskImportError(row=row_number, errors=errors))
+            continue
+        now = datetime.now(timezone.utc)
+        chunk.append(
+            (
+                user_id,
+                project_id,
+                task.title,
+                task.description,
+                task.status,
+                task.priority,
+                task.deadline,
+                task.completed_at,
+                now,
+                now,
+            )
+        )
+        add_stats_delta(stats, task.status, task.priority)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await _copy_chunk(session, chunk)
+            result.imported += len(chunk)
+            chunk = []
+    if chunk:
+        await _copy_chunk(session, chunk)
+        result.imported += len(chunk)
+    if result.imported:
+        await bump_project_version(session, project_id, "import", stats)
+    await session.commit()
+    if result.imported:
+        await response_cache.invalidate(tasks_scope(project_id))
+    return result
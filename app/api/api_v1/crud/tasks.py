@@ -1,15 +1,301 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, literal, literal_column, tuple_, and_, or_, any_, bindparam, case, cast, func, Integer, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from collections import Counter
 from typing import Sequence
-from app.models import Task
-from app.schemas.task import TaskCreate
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models import Task, Project, ProjectTaskStats
+from app.models.task import PRIORITY_ORDER, priority_rank_sql
+from app.schemas.task import TaskCreate, TaskRead, TaskBatchRequest, TaskBatchResult, TaskFilters
+from app.api.api_v1.crud.pagination import encode_cursor, decode_cursor
+from app.core.cache import response_cache, tasks_scope
+from app.core.config import settings
+from app.core.events import TASK_EVENTS_CHANNEL
 
 
-async def get_project_tasks(session: AsyncSession, project_id: int) -> Sequence[Task]:
-    """Получить все задачи проекта"""
-    stmt = select(Task).where(Task.project_id == project_id).order_by(Task.id)
-    result = await session.scalars(stmt)
-    return result.all()
+TASK_SORT_KEYS = ("id", "deadline", "priority", "created_at")
+
+# literal SQL (not bound parameters) so the planner can match the expression index
+priority_rank = literal_column(priority_rank_sql("tasks.priority"))
+PRIORITY_RANKS = {value: rank for rank, value in enumerate(PRIORITY_ORDER)}
+COMPLETED_STATUS = "completed"
+# a literal, not a parameter, so partial indexes on open tasks stay usable
+COMPLETED = literal_column(f"'{COMPLETED_STATUS}'")
+# counters of project_task_stats, in column order
+STATS_COUNTERS = ("total", "done", *PRIORITY_ORDER)
+
+# columns of `TaskRead`, returned directly by the write statements
+TASK_READ_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.deadline,
+    Task.completed_at,
+)
+# plus what keyset cursors need; used by the fast (column-only) listing path
+TASK_ROW_COLUMNS = TASK_READ_COLUMNS + (Task.created_at,)
+
+
+def _owned_project(project_id: int, user_id: int):
+    """EXISTS-условие: проект существует и принадлежит пользователю"""
+    return (
+        select(Project.id)
+        .where(Project.id == project_id, Project.user_id == user_id)
+        .exists()
+    )
+
+
+def _task_event(op: str, project_id: int, *columns):
+    """pg_notify(...) с событием об изменении задач; доставляется подписчикам после COMMIT"""
+    event = [literal("op"), literal(op), literal("project_id"), literal(project_id)]
+    if columns:
+        # column.name is a quoted_name, which literal() cannot infer a type for
+        task = func.json_build_object(*(arg for column in columns for arg in (literal(column.name, Text), column)))
+        event += [literal("task"), task]
+    return func.pg_notify(TASK_EVENTS_CHANNEL, cast(func.json_build_object(*event), Text))
+
+
+def _with_project_bump(changed, project_id: int, op: str, stats=None):
+    """SELECT из CTE записи в tasks; версия проекта растёт, только если строки изменились.
+
+    Всё выполняется одним запросом: `WITH changed AS (...), bumped AS
+    (UPDATE projects ...) SELECT * FROM changed`. Если включён realtime,
+    в тот же SELECT добавляется pg_notify с событием `op`; если включены
+    счётчики — CTE, прибавляющий к ним строку `stats` (см. `_stats_delta`).
+    """
+    bumped = (
+        update(Project.__table__)
+        .where(Project.id == project_id, select(changed.c.id).exists())
+        .values(version=Project.version + 1, updated_at=func.now())
+        .cte("bumped_project")
+    )
+    columns = list(changed.c)
+    if settings.realtime.enabled:
+        columns.append(_task_event(op, project_id, *changed.c).label("notified"))
+    stmt = select(*columns).add_cte(bumped)
+    if stats is not None and settings.stats.counters_table:
+        stmt = stmt.add_cte(stats_upsert(stats).cte("stats"))
+    return stmt
+
+
+async def bump_project_version(session: AsyncSession, project_id: int, op: str, stats: Counter) -> None:
+    """Отдельный UPDATE версии проекта (и событие `op`) для пакетных путей записи.
+
+    Изменения счётчиков `stats` (см. `add_stats_delta`) применяются в том же запросе.
+    """
+    stmt = (
+        update(Project.__table__)
+        .where(Project.id == project_id)
+        .values(version=Project.version + 1, updated_at=func.now())
+    )
+    if settings.realtime.enabled:
+        stmt = stmt.returning(_task_event(op, project_id))
+    if settings.stats.counters_table and any(stats.values()):
+        source = select(literal(project_id), *(literal(stats[name]) for name in STATS_COUNTERS), func.now())
+        stmt = stmt.add_cte(stats_upsert(source).cte("stats"))
+    await session.execute(stmt)
+
+
+def stats_columns():
+    """Агрегаты по задачам: total, done и количество по каждому приоритету"""
+    return (
+        func.count(Task.id).label("total"),
+        func.count(Task.id).filter(Task.status == COMPLETED).label("done"),
+        *(
+            func.count(Task.id).filter(Task.priority == literal_column(f"'{value}'")).label(value)
+            for value in PRIORITY_ORDER
+        ),
+    )
+
+
+def stats_upsert(source, add: bool = True):
+    """INSERT ... ON CONFLICT (project_id) DO UPDATE в project_task_stats.
+
+    `source` даёт строки `(project_id, *STATS_COUNTERS, updated_at)`; при
+    `add=True` значения прибавляются к счётчикам, иначе заменяют их.
+    """
+    names = ["project_id", *STATS_COUNTERS, "updated_at"]
+    stmt = pg_insert(ProjectTaskStats).from_select(names, source)
+    counters = ProjectTaskStats.__table__.c
+    return stmt.on_conflict_do_update(
+        index_elements=[ProjectTaskStats.project_id],
+        set_={
+            **{name: counters[name] + stmt.excluded[name] if add else stmt.excluded[name] for name in STATS_COUNTERS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+def _stats_delta(project_id: int, source, *terms):
+    """Изменения счётчиков проекта по строкам `source` — одна строка для `stats_upsert`.
+
+    `terms` — тройки (знак, status, priority): +1 для новой версии задачи,
+    -1 для прежней. Пустой `source` не даёт строки, счётчики не меняются.
+    """
+    def changes(predicate):
+        return func.sum(sum(case((predicate(status, priority), sign), else_=0) for sign, status, priority in terms))
+
+    return (
+        select(
+            literal(project_id),
+            func.count() * sum(sign for sign, _, _ in terms),
+            changes(lambda status, _: status == COMPLETED),
+            *(changes(lambda _, priority, value=value: priority == value) for value in PRIORITY_ORDER),
+            func.now(),
+        )
+        .select_from(source)
+        .having(func.count() > 0)
+    )
+
+
+def add_stats_delta(stats: Counter, status: str, priority: str, sign: int = 1) -> None:
+    """Учесть в `stats` появление (sign=1) или исчезновение (sign=-1) задачи"""
+    stats["total"] += sign
+    if status == COMPLETED_STATUS:
+        stats["done"] += sign
+    if priority in PRIORITY_ORDER:
+        stats[priority] += sign
+
+
+def _owned_tasks_stmt(project_id: int, user_id: int, *conditions, columns: bool = False):
+    """Задачи проекта; владелец проверяется EXISTS-условием без JOIN.
+
+    Условие не коррелировано, Postgres вычисляет его один раз (InitPlan),
+    поэтому порядок строк по-прежнему даёт индекс с префиксом project_id.
+    """
+    selected = TASK_ROW_COLUMNS if columns else (Task,)
+    return select(*selected).where(Task.project_id == project_id, _owned_project(project_id, user_id), *conditions)
+
+
+async def _fetch_tasks(session: AsyncSession, stmt, columns: bool = False) -> list:
+    result = await session.execute(stmt)
+    return list(result.all() if columns else result.scalars().all())
+
+
+async def _owned_tasks(session: AsyncSession, stmt, project_id: int, user_id: int, columns: bool = False) -> list | None:
+    """Выполнить запрос задач; None, если проект не найден или чужой.
+
+    Пустой результат неоднозначен (нет задач или нет доступа), поэтому только
+    в этом случае владелец проверяется отдельным запросом.
+    """
+    tasks = await _fetch_tasks(session, stmt, columns)
+    if not tasks and not await session.scalar(select(_owned_project(project_id, user_id))):
+        return None
+    return tasks
+
+
+async def get_project_tasks(
+    session: AsyncSession,
+    project_id: int,
+    user_id: int,
+    columns: bool = False,
+    filters: TaskFilters | None = None,
+) -> list | None:
+    """Получить все задачи проекта; None, если проект не найден или чужой.
+
+    При `columns=True` возвращаются строки из `TASK_ROW_COLUMNS` вместо ORM-объектов.
+    """
+    stmt = _owned_tasks_stmt(project_id, user_id, *_filter_conditions(filters), columns=columns).order_by(Task.id)
+    return await _owned_tasks(session, stmt, project_id, user_id, columns=columns)
+
+
+def _task_sort_value(task: Task, sort: str):
+    if sort == "priority":
+        return PRIORITY_RANKS.get(task.priority, len(PRIORITY_ORDER))
+    return getattr(task, sort)
+
+
+def _keyset_condition(sort: str, value, last_id: int):
+    """Rows strictly after `(value, last_id)` in `(sort, id)` order, as an index condition.
+
+    After a non-NULL deadline this leaves out the NULL deadlines that follow
+    it: with an `OR deadline IS NULL` the comparison could not bound the index
+    scan, so `get_project_tasks_page` reads them with a query of their own.
+    """
+    if sort == "id":
+        return Task.id > last_id
+    if sort == "priority":
+        return tuple_(priority_rank, Task.id) > tuple_(value, last_id)
+    column = getattr(Task, sort)
+    if value is None:
+        return and_(column.is_(None), Task.id > last_id)
+    return tuple_(column, Task.id) > tuple_(value, last_id)
+
+
+def _filter_conditions(filters: TaskFilters | None) -> list:
+    """Условия фильтрации задач; каждое опирается на индекс с префиксом project_id"""
+    if filters is None:
+        return []
+    conditions = []
+    if filters.status:
+        conditions.append(Task.status.in_(filters.status))
+    if filters.priority:
+        conditions.append(Task.priority.in_(filters.priority))
+    if filters.deadline_from is not None:
+        conditions.append(Task.deadline >= filters.deadline_from)
+    if filters.deadline_to is not None:
+        conditions.append(Task.deadline < filters.deadline_to)
+    if filters.completed is not None:
+        conditions.append(Task.status == COMPLETED if filters.completed else Task.status != COMPLETED)
+    if filters.overdue is not None:
+        if filters.overdue:
+            conditions.append(and_(Task.deadline < func.now(), Task.status != COMPLETED))
+        else:
+            # не ~overdue: для задач без дедлайна отрицание даёт NULL и отбрасывает их
+            conditions.append(or_(Task.deadline.is_(None), Task.deadline >= func.now(), Task.status == COMPLETED))
+    return conditions
+
+
+def _order_tasks(stmt, sort: str):
+    """Порядок `(sort, id)`, совпадающий с индексом `ix_tasks_project_id_<sort>_id`"""
+    if sort == "id":
+        return stmt.order_by(Task.id)
+    if sort == "priority":
+        return stmt.order_by(priority_rank, Task.id)
+    return stmt.order_by(getattr(Task, sort).asc().nulls_last(), Task.id)
+
+
+async def get_project_tasks_page(
+    session: AsyncSession,
+    project_id: int,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    sort: str = "id",
+    columns: bool = False,
+    filters: TaskFilters | None = None,
+) -> tuple[list, str | None] | None:
+    """Получить страницу задач проекта (keyset-пагинация по `(sort, id)`).
+
+    Проверка владельца проекта выполняется в том же запросе (для пустой
+    страницы — отдельным); None, если проект не найден или чужой. При `columns=True` — строки вместо ORM-объектов.
+    """
+    conditions = _filter_conditions(filters)
+    keyset = []
+    null_deadlines_follow = False
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        keyset.append(_keyset_condition(sort, value, last_id))
+        null_deadlines_follow = sort == "deadline" and value is not None
+    stmt = _order_tasks(_owned_tasks_stmt(project_id, user_id, *conditions, *keyset, columns=columns), sort)
+    tasks = await _owned_tasks(session, stmt.limit(limit + 1), project_id, user_id, columns=columns)
+    if tasks is None:
+        return None
+    if null_deadlines_follow and len(tasks) <= limit:
+        # задачи без дедлайна идут после всех остальных; запрос нужен только странице на границе,
+        # а порядок (deadline, id) вместо id совпадает с индексом
+        stmt = _owned_tasks_stmt(project_id, user_id, *conditions, Task.deadline.is_(None), columns=columns)
+        stmt = _order_tasks(stmt, sort).limit(limit + 1 - len(tasks))
+        tasks += await _fetch_tasks(session, stmt, columns)
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        next_cursor = encode_cursor(sort, _task_sort_value(last, sort), last.id)
+    return tasks, next_cursor
 
 
 async def get_all_tasks(session: AsyncSession) -> Sequence[Task]:
@@ -18,34 +304,214 @@ async def get_all_tasks(session: AsyncSession) -> Sequence[Task]:
     return result.all()
 
 
-async def create_task(session: AsyncSession, task_create: TaskCreate, user_id: int, project_id: int) -> Task:
-    task = Task(**task_create.model_dump(), user_id=user_id, project_id=project_id)
-    session.add(task)
+async def create_task(session: AsyncSession, task_create: TaskCreate, user_id: int, project_id: int) -> TaskRead | None:
+    """Создать задачу одним INSERT ... SELECT ... WHERE EXISTS; None, если проект чужой.
+
+    В том же запросе увеличивается версия проекта (см. `_with_project_bump`).
+    """
+    now = datetime.now(timezone.utc)
+    values = {
+        **task_create.model_dump(),
+        "user_id": user_id,
+        "project_id": project_id,
+        "created_at": now,
+        "updated_at": now,
+    }
+    source = select(*(literal(v, Task.__table__.c[k].type) for k, v in values.items())).where(
+        _owned_project(project_id, user_id)
+    )
+    changed = insert(Task.__table__).from_select(list(values), source).returning(*TASK_READ_COLUMNS).cte("changed")
+    stats = _stats_delta(project_id, changed, (1, changed.c.status, changed.c.priority))
+    row = (await session.execute(_with_project_bump(changed, project_id, "create", stats))).one_or_none()
     await session.commit()
-    await session.refresh(task)
-    return task
+    if row is None:
+        return None
+    await response_cache.invalidate(tasks_scope(project_id))
+    return TaskRead.model_validate(row)
 
 
-async def delete_task(session: AsyncSession, task_id: int, user_id: int) -> Task | None:
-    """Удалить задачу с проверкой прав доступа"""
-    stmt = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-    result = await session.scalars(stmt)
-    task = result.first()
-    if task:
-        await session.delete(task)
-        await session.commit()
-    return task
+async def delete_task(session: AsyncSession, task_id: int, user_id: int, project_id: int) -> int | None:
+    """Удалить задачу с проверкой прав доступа (DELETE ... RETURNING id)"""
+    changed = (
+        delete(Task.__table__)
+        .where(
+            Task.id == task_id,
+            Task.project_id == project_id,
+            _owned_project(project_id, user_id),
+        )
+        .returning(Task.id, Task.status, Task.priority)
+        .cte("changed")
+    )
+    stats = _stats_delta(project_id, changed, (-1, changed.c.status, changed.c.priority))
+    deleted_id = await session.scalar(_with_project_bump(changed, project_id, "delete", stats))
+    await session.commit()
+    if deleted_id is not None:
+        await response_cache.invalidate(tasks_scope(project_id))
+    return deleted_id
 
 
-async def update_task(session: AsyncSession, task_id: int, user_id: int, task_update: dict) -> Task | None:
-    """Обновить задачу с проверкой прав доступа"""
-    stmt = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-    result = await session.scalars(stmt)
-    task = result.first()
-    if task:
-        for key, value in task_update.items():
-            if value is not None:
-                setattr(task, key, value)
-        await session.commit()
-        await session.refresh(task)
-    return task
\ No newline at end of file
+async def update_task(
+    session: AsyncSession, task_id: int, user_id: int, project_id: int, task_update: dict
+) -> TaskRead | None:
+    """Обновить задачу с проверкой прав доступа (UPDATE ... RETURNING).
+
+    Прежние status и priority для счётчиков читает CTE `old` с FOR UPDATE:
+    после ожидания блокировки он видит последнюю версию строки.
+    """
+    values = {key: value for key, value in task_update.items() if value is not None}
+    values["updated_at"] = datetime.now(timezone.utc)
+    old = (
+        select(Task.id, Task.status, Task.priority)
+        .where(
+            Task.id == task_id,
+            Task.project_id == project_id,
+            _owned_project(project_id, user_id),
+        )
+        .with_for_update(of=Task)
+        .cte("old")
+    )
+    changed = (
+        update(Task.__table__)
+        .where(Task.id == old.c.id)
+        .values(**values)
+        .returning(*TASK_READ_COLUMNS)
+        .cte("changed")
+    )
+    stats = _stats_delta(
+        project_id,
+        changed.join(old, old.c.id == changed.c.id),
+        (1, changed.c.status, changed.c.priority),
+        (-1, old.c.status, old.c.priority),
+    )
+    row = (await session.execute(_with_project_bump(changed, project_id, "update", stats))).one_or_none()
+    await session.commit()
+    if row is None:
+        return None
+    await response_cache.invalidate(tasks_scope(project_id))
+    return TaskRead.model_validate(row)
+
+
+def _typed_array(values: list, type_):
+    """Массив-параметр с явным приведением типа, понятный asyncpg"""
+    return cast(bindparam(None, values, type_=ARRAY(type_)), ARRAY(type_))
+
+
+async def _batch_create(
+    session: AsyncSession, items: list[TaskCreate], user_id: int, project_id: int, stats: Counter
+) -> list[TaskBatchResult]:
+    if not items:
+        return []
+    now = datetime.now(timezone.utc)
+    params = [
+        {**item.model_dump(), "user_id": user_id, "project_id": project_id, "created_at": now, "updated_at": now}
+        for item in items
+    ]
+    stmt = insert(Task).returning(*TASK_READ_COLUMNS, sort_by_parameter_order=True)
+    rows = (await session.execute(stmt, params)).all()
+    for row in rows:
+        add_stats_delta(stats, row.status, row.priority)
+    return [
+        TaskBatchResult(op="create", index=i, status=201, id=row.id, task=TaskRead.model_validate(row))
+        for i, row in enumerate(rows)
+    ]
+
+
+async def _batch_update(
+    session: AsyncSession, items: list, project_id: int, stats: Counter
+) -> list[TaskBatchResult]:
+    """UPDATE ... FROM unnest(...) по одной инструкции на каждый набор изменяемых полей.
+
+    Прежние status и priority (для счётчиков) возвращает подзапрос `old` с FOR UPDATE.
+    """
+    results: list[TaskBatchResult] = []
+    groups: dict[tuple[str, ...], list[tuple[int, dict]]] = {}
+    seen: set[int] = set()
+    for index, item in enumerate(items):
+        if item.id in seen:
+            results.append(TaskBatchResult(op="update", index=index, status=409, id=item.id, detail="Duplicate task id in batch"))
+            continue
+        seen.add(item.id)
+        values = {k: v for k, v in item.model_dump(exclude_unset=True, exclude={"id"}).items() if v is not None}
+        groups.setdefault(tuple(sorted(values)), []).append((index, {"id": item.id, **values}))
+
+    columns = Task.__table__.c
+    now = datetime.now(timezone.utc)
+    for keys, group in groups.items():
+        names = ("id", *keys)
+        source = func.unnest(
+            *(_typed_array([values[name] for _, values in group], columns[name].type) for name in names)
+        ).table_valued(*names).render_derived(name="v")
+        old = (
+            select(Task.id, Task.status, Task.priority)
+            .where(Task.project_id == project_id, Task.id == any_(_typed_array([values["id"] for _, values in group], Integer)))
+            .with_for_update()
+            .subquery("old")
+        )
+        stmt = (
+            update(Task)
+            .where(Task.id == source.c.id, Task.id == old.c.id)
+            .values({**{columns[name]: source.c[name] for name in keys}, columns["updated_at"]: now})
+            .returning(*TASK_READ_COLUMNS, old.c.status.label("old_status"), old.c.priority.label("old_priority"))
+            .execution_options(synchronize_session=False)
+        )
+        updated = {row.id: row for row in (await session.execute(stmt)).all()}
+        for row in updated.values():
+            add_stats_delta(stats, row.status, row.priority)
+            add_stats_delta(stats, row.old_status, row.old_priority, sign=-1)
+        for index, values in group:
+            row = updated.get(values["id"])
+            if row is None:
+                results.append(TaskBatchResult(op="update", index=index, status=404, id=values["id"], detail="Task not found"))
+            else:
+                results.append(TaskBatchResult(op="update", index=index, status=200, id=row.id, task=TaskRead.model_validate(row)))
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+async def _batch_delete(
+    session: AsyncSession, task_ids: list[int], project_id: int, stats: Counter
+) -> list[TaskBatchResult]:
+    """Один DELETE по всем id; повторный id в пакете даёт 409, как и в `_batch_update`."""
+    if not task_ids:
+        return []
+    unique_ids = list(dict.fromkeys(task_ids))
+    stmt = (
+        delete(Task)
+        .where(Task.project_id == project_id, Task.id == any_(_typed_array(unique_ids, Integer)))
+        .returning(Task.id, Task.status, Task.priority)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = set()
+    for row in (await session.execute(stmt)).all():
+        deleted.add(row.id)
+        add_stats_delta(stats, row.status, row.priority, sign=-1)
+    results: list[TaskBatchResult] = []
+    seen: set[int] = set()
+    for index, task_id in enumerate(task_ids):
+        if task_id in seen:
+            results.append(TaskBatchResult(op="delete", index=index, status=409, id=task_id, detail="Duplicate task id in batch"))
+        elif task_id in deleted:
+            results.append(TaskBatchResult(op="delete", index=index, status=200, id=task_id))
+        else:
+            results.append(TaskBatchResult(op="delete", index=index, status=404, id=task_id, detail="Task not found"))
+        seen.add(task_id)
+    return results
+
+
+async def run_task_batch(
+    session: AsyncSession, batch: TaskBatchRequest, user_id: int, project_id: int
+) -> list[TaskBatchResult]:
+    """Выполнить пакет create/update/delete одной транзакцией.
+
+    Владелец проекта проверяется вызывающим кодом. Каждая операция получает
+    свой результат; отсутствующие задачи дают 404 и не прерывают пакет.
+    """
+    stats = Counter()
+    results = await _batch_create(session, batch.create, user_id, project_id, stats)
+    results += await _batch_update(session, batch.update, project_id, stats)
+    results += await _batch_delete(session, batch.delete, project_id, stats)
+    if any(result.status < 300 for result in results):
+        await bump_project_version(session, project_id, "batch", stats)
+    await session.commit()
+    await response_cache.invalidate(tasks_scope(project_id))
+    return results
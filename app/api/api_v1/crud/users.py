@@ -1,9 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func, or_
+from sqlalchemy.exc import IntegrityError
 from typing import Sequence
-from app.models import User
-from app.schemas.user import UserCreate
-from app.auth.utils import hash_password
+from app.models import Project, Task, User
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.auth.hashing import password_hasher
+from app.auth.user_cache import user_state_cache
+from app.core.cache import response_cache, projects_scope, tasks_scope
 from fastapi import HTTPException, status
 
 
@@ -13,21 +17,37 @@ async def get_all_users(session: AsyncSession) -> Sequence[User]:
     return result.all()
 
 
-async def create_user(session: AsyncSession, user_create: UserCreate) -> User:
-    # ensure email is unique
-    existing = await get_user_by_email(session, user_create.email)
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+async def create_user(session: AsyncSession, user_create: UserCreate) -> UserRead:
+    """Create a user with a single INSERT ... ON CONFLICT (email) DO NOTHING RETURNING.
 
+    A taken email is rejected by an indexed lookup before the password is
+    hashed, so duplicate sign-ups cost no bcrypt work; ON CONFLICT still
+    guards against two concurrent sign-ups with the same email.
+    """
+    email_taken = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    taken = await session.scalar(select(select(User.id).where(User.email == user_create.email).exists()))
+    # end the read so no pooled connection is held while the password is hashed
+    await session.rollback()
+    if taken:
+        raise email_taken
     # hash plain password on server
-    hashed = hash_password(user_create.password)
+    hashed = await password_hasher.hash(user_create.password)
     payload = user_create.model_dump()
     payload.pop("password", None)
-    user = User(**payload, hashed_password=hashed)
-    session.add(user)
+    stmt = (
+        pg_insert(User)
+        .values(**payload, hashed_password=hashed)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User.id, User.email, User.name)
+    )
+    row = (await session.execute(stmt)).one_or_none()
+    # ensure email is unique
+    if row is None:
+        await session.rollback()
+        raise email_taken
     await session.commit()
-    await session.refresh(user)
-    return user
+    user_state_cache.invalidate(row.id)
+    return UserRead.model_validate(row)
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
@@ -42,3 +62,64 @@ async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
     stmt = select(User).where(User.id == user_id)
     result = await session.scalar(stmt)
     return result
+
+
+async def update_user(session: AsyncSession, user_id: int, user_update: UserUpdate) -> UserRead | None:
+    """Изменить имя, email или пароль одним UPDATE ... RETURNING; None, если пользователя нет.
+
+    Кэш состояния пользователя сбрасывается, так что следующий запрос этого
+    воркера снова проверит пользователя в БД. Имя и email в уже выданных
+    токенах остаются прежними до нового входа.
+    """
+    email_taken = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    values = user_update.model_dump(exclude_unset=True, exclude_none=True)
+    if "email" in values:
+        taken = await session.scalar(
+            select(select(User.id).where(User.email == values["email"], User.id != user_id).exists())
+        )
+        await session.rollback()
+        if taken:
+            raise email_taken
+    if "password" in values:
+        values["hashed_password"] = await password_hasher.hash(values.pop("password"))
+    if not values:
+        row = (await session.execute(select(User.id, User.email, User.name).where(User.id == user_id))).one_or_none()
+        return UserRead.model_validate(row) if row is not None else None
+    stmt = update(User).where(User.id == user_id).values(**values).returning(User.id, User.email, User.name)
+    try:
+        row = (await session.execute(stmt)).one_or_none()
+    except IntegrityError:
+        # тот же email успел занять параллельный запрос
+        await session.rollback()
+        raise email_taken
+    await session.commit()
+    user_state_cache.invalidate(user_id)
+    return UserRead.model_validate(row) if row is not None else None
+
+
+async def delete_user(session: AsyncSession, user_id: int) -> int | None:
+    """Удалить пользователя вместе с его проектами и задачами одним запросом.
+
+    Токены удалённого пользователя отклоняются сразу, без ожидания TTL кэша,
+    но только в этом воркере: в остальных — по истечении `user_cache_ttl`.
+    """
+    owned_projects = select(Project.id).where(Project.user_id == user_id)
+    deleted_tasks = delete(Task).where(or_(Task.user_id == user_id, Task.project_id.in_(owned_projects))).cte(
+        "deleted_tasks"
+    )
+    deleted_projects = delete(Project).where(Project.user_id == user_id).returning(Project.id).cte("deleted_projects")
+    stmt = (
+        delete(User)
+        .where(User.id == user_id)
+        .add_cte(deleted_tasks)
+        .add_cte(deleted_projects)
+        .returning(User.id, select(func.array_agg(deleted_projects.c.id)).scalar_subquery())
+        .execution_options(synchronize_session=False)
+    )
+    row = (await session.execute(stmt)).one_or_none()
+    await session.commit()
+    if row is None:
+        return None
+    user_state_cache.revoke(user_id)
+    await response_cache.invalidate(projects_scope(user_id), *(tasks_scope(project_id) for project_id in row[1] or ()))
+    return row[0]
@@ -0,0 +1,30 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.api_v1.crud.auth import get_current_auth_user
+from app.api.api_v1.crud.export import stream_user_export
+from app.models import db_helper
+from app.schemas.user import User
+
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@router.get("")
+async def export_data(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    current_user: User = Depends(get_current_auth_user),
+):
+    """Выгрузить все проекты и задачи пользователя потоком (NDJSON или CSV)"""
+    return StreamingResponse(
+        stream_user_export(db_helper.session_factory, user_id=current_user.id, fmt=format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="export.{format}"'},
+    )
@@ -1,26 +1,100 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.api_v1.crud.projects import get_all_projects
+from app.api.api_v1.crud.projects import (
+    get_all_projects,
+    get_projects_version,
+    get_projects_with_task_counts,
+    get_projects_with_tasks,
+)
+from app.api.api_v1.conditional import make_etag, params_digest, etag_matches, not_modified
 from app.models import db_helper
-from app.schemas.project import ProjectRead, ProjectCreate
-from typing import Annotated
+from app.schemas.project import (
+    MAX_EMBEDDED_TASKS,
+    ProjectCreate,
+    ProjectRead,
+    ProjectStats,
+    ProjectTaskCounts,
+    ProjectWithTasks,
+)
+from app.api.api_v1.crud.stats import get_projects_stats
+from typing import Annotated, Literal
 from app.api.api_v1.crud.projects import create_project as create_one_project
 from app.schemas.user import User
 from app.api.api_v1.crud.auth import get_current_auth_user
 from app.api.api_v1.crud.projects import delete_project as delete_one_project
+from app.core.cache import response_cache, projects_scope
+from app.core.config import settings
+from app.core import fastjson
+from app.core.metrics import serialization_timer
 
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+project_list_adapter = TypeAdapter(list[ProjectRead])
+project_counts_adapter = TypeAdapter(list[ProjectTaskCounts])
+project_tasks_adapter = TypeAdapter(list[ProjectWithTasks])
+PROJECT_READ_FIELDS = tuple(ProjectRead.model_fields)
 
-@router.get("", response_model=list[ProjectRead])
+
+@router.get("", response_model=list[ProjectWithTasks] | list[ProjectTaskCounts] | list[ProjectRead])
 async def get_projects(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    request: Request,
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
+    current_user: User = Depends(get_current_auth_user),
+    include: Literal["tasks", "task_counts"] | None = None,
+    tasks_limit: int = Query(5, ge=1, le=MAX_EMBEDDED_TASKS),
+):
+    count, versions, last_id = await get_projects_version(session=session, user_id=current_user.id)
+    # version проекта растёт при любой записи в его задачи, поэтому ETag покрывает и include
+    etag = make_etag(
+        "p",
+        current_user.id,
+        count,
+        versions,
+        last_id,
+        params_digest(include, tasks_limit if include == "tasks" else None),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag}
+    if include is not None:
+        # записи в задачи сбрасывают только кэш задач, поэтому вложенные ответы не кэшируются
+        if include == "tasks":
+            projects = await get_projects_with_tasks(session=session, user_id=current_user.id, limit=tasks_limit)
+            adapter = project_tasks_adapter
+        else:
+            projects = await get_projects_with_task_counts(session=session, user_id=current_user.id)
+            adapter = project_counts_adapter
+        with serialization_timer():
+            body = adapter.dump_json(projects)
+        return Response(content=body, media_type="application/json", headers=headers)
+    # the ETag carries the version inputs, so the body and its ETag always match
+    cached, cache_key = await response_cache.lookup(projects_scope(current_user.id), etag, "list")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+    if settings.api.fast_json:
+        rows = await get_all_projects(session=session, user_id=current_user.id, columns=True)
+        with serialization_timer():
+            body = fastjson.dumps(fastjson.rows_to_dicts(rows, PROJECT_READ_FIELDS))
+    else:
+        projects = await get_all_projects(session=session, user_id=current_user.id)
+        with serialization_timer():
+            body = project_list_adapter.dump_json(
+                project_list_adapter.validate_python(projects, from_attributes=True)
+            )
+    await response_cache.store(cache_key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/stats", response_model=list[ProjectStats])
+async def get_stats(
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     current_user: User = Depends(get_current_auth_user)
 ):
-    projects = await get_all_projects(session=session, user_id=current_user.id)
-    return projects
+    """Сводка по задачам всех проектов пользователя: total, done, overdue, по приоритетам"""
+    return await get_projects_stats(session=session, user_id=current_user.id)
 
 
 @router.post("", response_model=ProjectRead)
@@ -0,0 +1,33 @@
+import math
+
+from fastapi import HTTPException, Request, status
+
+from app.api.api_v1.crud.auth import get_optional_token_payload
+from app.core.ratelimit import rate_limiter
+
+
+def route_key(request: Request) -> str:
+    """Bucket name of the matched route: method and path template, e.g. "GET /api/v1/search"."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{request.method} {path}" if path else "unmatched"
+
+
+async def enforce_rate_limit(request: Request) -> None:
+    """Router-level dependency: runs before the route's own dependencies (DB session, bcrypt)."""
+    if not rate_limiter.enabled:
+        return
+    # decoded only when limiting is on; the auth dependencies reuse the result
+    payload = get_optional_token_payload(request)
+    sub = payload.get("sub") if payload else None
+    if sub:
+        identity = f"user:{sub}"
+    else:
+        identity = f"ip:{request.client.host if request.client else 'unknown'}"
+    retry_after = await rate_limiter.check(route_key(request), identity)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
@@ -0,0 +1,33 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.api_v1.crud.auth import get_current_auth_user
+from app.api.api_v1.crud.search import search_tasks, search_projects
+from app.models import db_helper
+from app.schemas.search import SearchResponse, TaskSearchHit, ProjectSearchHit
+from app.schemas.user import User
+
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Literal["all", "tasks", "projects"] = Query("all"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10_000),
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)] = None,
+    current_user: User = Depends(get_current_auth_user),
+):
+    """Поиск по задачам и проектам пользователя (синтаксис websearch: "фраза", -исключить, or)"""
+    response = SearchResponse()
+    if type in ("all", "tasks"):
+        rows = await search_tasks(session, current_user.id, q, limit, offset)
+        response.tasks = [TaskSearchHit.model_validate(row) for row in rows]
+    if type in ("all", "projects"):
+        rows = await search_projects(session, current_user.id, q, limit, offset)
+        response.projects = [ProjectSearchHit.model_validate(row) for row in rows]
+    return response
@@ -1,22 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from typing import Literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(prefix="/projects", tags=["Tasks"])
 from app.api.api_v1.crud.tasks import (
     get_project_tasks,
+    get_project_tasks_page,
     create_task,
     delete_task,
     update_task,
+    run_task_batch,
 )
-from app.api.api_v1.crud.projects import get_project_by_id
+from app.api.api_v1.crud.projects import get_project_by_id, get_project_version
+from app.api.api_v1.conditional import make_etag, params_digest, etag_matches, not_modified
+from app.api.api_v1.crud.task_import import import_tasks
 from app.models import db_helper
-from app.schemas.task import TaskRead, TaskCreate, TaskUpdate
+from app.core.cache import response_cache, tasks_scope
+from app.core.config import settings
+from app.core import fastjson
+from app.core.metrics import serialization_timer
+from app.core.events import task_event_hub
+from app.schemas.task import (
+    TaskRead,
+    TaskCreate,
+    TaskUpdate,
+    TaskPage,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskImportResult,
+    TaskFilters,
+)
 from typing import Annotated
 from app.schemas.user import User
 from app.api.api_v1.crud.auth import get_current_auth_user
 
 
+task_list_adapter = TypeAdapter(list[TaskRead])
+TASK_READ_FIELDS = tuple(TaskRead.model_fields)
+
+
 async def get_current_project(
     project_id: int,
     session: AsyncSession,
@@ -29,17 +59,145 @@ async def get_current_project(
     return project_id
 
 
-@router.get("/{project_id}/tasks", response_model=list[TaskRead])
+async def raise_task_not_found(
+    project_id: int,
+    session: AsyncSession,
+    current_user: User,
+):
+    """Пустой результат запроса с проверкой владельца: уточняем, чего именно нет.
+
+    Выполняется только на пути ошибки, поэтому успешный запрос остаётся
+    одним обращением к БД.
+    """
+    await get_current_project(project_id=project_id, session=session, current_user=current_user)
+    raise HTTPException(status_code=404, detail="Task not found")
+
+
+def get_task_filters(
+    status: list[str] | None = Query(None),
+    priority: list[str] | None = Query(None),
+    deadline_from: datetime | None = Query(None),
+    deadline_to: datetime | None = Query(None),
+    overdue: bool | None = Query(None),
+    completed: bool | None = Query(None),
+) -> TaskFilters:
+    """Фильтры списка задач из query-параметров (status и priority можно повторять)"""
+    return TaskFilters(
+        status=status,
+        priority=priority,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+        overdue=overdue,
+        completed=completed,
+    )
+
+
+@router.get("/{project_id}/tasks", response_model=TaskPage | list[TaskRead])
 async def get_tasks(
+    request: Request,
+    project_id: int = Path(..., gt=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    sort: Literal["id", "deadline", "priority", "created_at"] = Query("id"),
+    paginate: bool = Query(True, description="false returns the full unpaginated list"),
+    filters: TaskFilters = Depends(get_task_filters),
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)] = None,
+    current_user: User = Depends(get_current_auth_user),
+):
+    """Получить задачи проекта постранично (или все при paginate=false)"""
+    project_not_found = HTTPException(status_code=404, detail="Project not found")
+    version = await get_project_version(session=session, project_id=project_id, user_id=current_user.id)
+    if version is None:
+        raise project_not_found
+    filters_key = filters.model_dump_json(exclude_none=True)
+    if filters.overdue is not None:
+        # "overdue" changes with time alone, so cached results expire every minute
+        filters_key += f":{int(time.time() // 60)}"
+    etag = make_etag("t", project_id, version, params_digest(paginate, limit, sort, cursor, filters_key))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag}
+    # keyed on the version the ETag was built from, so a body cached before a write
+    # (by this or another worker) is never sent with the newer ETag
+    cached, cache_key = await response_cache.lookup(
+        tasks_scope(project_id), version, f"{current_user.id}:{paginate}:{limit}:{sort}:{cursor}:{filters_key}"
+    )
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+    fast = settings.api.fast_json
+    if not paginate:
+        tasks = await get_project_tasks(
+            session=session, project_id=project_id, user_id=current_user.id, columns=fast, filters=filters
+        )
+        if tasks is None:
+            raise project_not_found
+        with serialization_timer():
+            if fast:
+                body = fastjson.dumps(fastjson.rows_to_dicts(tasks, TASK_READ_FIELDS))
+            else:
+                body = task_list_adapter.dump_json(task_list_adapter.validate_python(tasks, from_attributes=True))
+        await response_cache.store(cache_key, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+    page = await get_project_tasks_page(
+        session=session,
+        project_id=project_id,
+        user_id=current_user.id,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        columns=fast,
+        filters=filters,
+    )
+    if page is None:
+        raise project_not_found
+    tasks, next_cursor = page
+    with serialization_timer():
+        if fast:
+            body = fastjson.dumps(
+                {"items": fastjson.rows_to_dicts(tasks, TASK_READ_FIELDS), "next_cursor": next_cursor}
+            )
+        else:
+            body = TaskPage.model_validate(
+                {"items": tasks, "next_cursor": next_cursor}, from_attributes=True
+            ).model_dump_json().encode()
+    await response_cache.store(cache_key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{project_id}/tasks/events")
+async def task_events(
     project_id: int = Path(..., gt=0),
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)] = None,
     current_user: User = Depends(get_current_auth_user),
 ):
-    """Получить все задачи проекта"""
-    # Проверяем, что проект принадлежит пользователю
+    """SSE-поток событий create/update/delete по задачам проекта"""
+    if not settings.realtime.enabled:
+        raise HTTPException(status_code=404, detail="Realtime events are disabled")
     await get_current_project(project_id=project_id, session=session, current_user=current_user)
-    tasks = await get_project_tasks(session=session, project_id=project_id)
-    return tasks
+    # don't hold a pooled connection for the lifetime of the stream
+    await session.close()
+    subscription = await task_event_hub.subscribe(project_id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.realtime.heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['op']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            task_event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/{project_id}/tasks", response_model=TaskRead)
@@ -50,9 +208,9 @@ async def create_task_endpoint(
     current_user: User = Depends(get_current_auth_user),
 ):
     """Создать новую задачу в проекте"""
-    # Проверяем, что проект принадлежит пользователю
-    await get_current_project(project_id=project_id, session=session, current_user=current_user)
     task = await create_task(session=session, task_create=task_create, user_id=current_user.id, project_id=project_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Project not found")
     return task
 
 
@@ -64,10 +222,8 @@ async def delete_task_endpoint(
     current_user: User = Depends(get_current_auth_user),
 ):
     """Удалить задачу"""
-    # Проверяем, что проект принадлежит пользователю
-    await get_current_project(project_id=project_id, session=session, current_user=current_user)
-    if await delete_task(session=session, task_id=task_id, user_id=current_user.id) is None:
-        raise HTTPException(status_code=404, detail="Task not found")
+    if await delete_task(session=session, task_id=task_id, user_id=current_user.id, project_id=project_id) is None:
+        await raise_task_not_found(project_id=project_id, session=session, current_user=current_user)
     return {"detail": "Task deleted successfully"}
 
 
@@ -80,14 +236,45 @@ async def update_task_endpoint(
     current_user: User = Depends(get_current_auth_user),
 ):
     """Обновить задачу"""
-    # Проверяем, что проект принадлежит пользователю
-    await get_current_project(project_id=project_id, session=session, current_user=current_user)
     updated_task = await update_task(
         session=session, 
         task_id=task_id, 
         user_id=current_user.id,
+        project_id=project_id,
         task_update=task_update.model_dump(exclude_unset=True)
     )
     if not updated_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return updated_task
\ No newline at end of file
+        await raise_task_not_found(project_id=project_id, session=session, current_user=current_user)
+    return updated_task
+
+
+@router.post("/{project_id}/tasks:batch", response_model=TaskBatchResponse)
+async def batch_tasks_endpoint(
+    batch: TaskBatchRequest,
+    project_id: int = Path(..., gt=0),
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)] = None,
+    current_user: User = Depends(get_current_auth_user),
+):
+    """Пакетно создать, обновить и удалить задачи проекта"""
+    await get_current_project(project_id=project_id, session=session, current_user=current_user)
+    results = await run_task_batch(session=session, batch=batch, user_id=current_user.id, project_id=project_id)
+    return TaskBatchResponse(results=results)
+
+
+@router.post("/{project_id}/tasks:import", response_model=TaskImportResult)
+async def import_tasks_endpoint(
+    request: Request,
+    project_id: int = Path(..., gt=0),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)] = None,
+    current_user: User = Depends(get_current_auth_user),
+):
+    """Импортировать задачи из NDJSON/CSV, переданных телом запроса"""
+    await get_current_project(project_id=project_id, session=session, current_user=current_user)
+    return await import_tasks(
+        session=session,
+        body=request.stream(),
+        user_id=current_user.id,
+        project_id=project_id,
+        fmt=format,
+    )
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.api_v1.crud.users import get_all_users
 from app.models import db_helper
-from app.schemas.user import UserRead, UserCreate
+from app.schemas.user import UserRead, UserCreate, UserUpdate
 from typing import Annotated
 from app.api.api_v1.crud.users import create_user as create_one_user
+from app.api.api_v1.crud.users import update_user as update_one_user
+from app.api.api_v1.crud.users import delete_user as delete_one_user
+from app.api.api_v1.crud.auth import get_current_auth_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("", response_model=list[UserRead])
 async def get_users(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
     users = await get_all_users(session=session)
     return users
@@ -25,3 +28,25 @@ async def create_user(
 ):
     user = await create_one_user(session=session, user_create=user_create)
     return user
+
+
+@router.patch("/me", response_model=UserRead)
+async def update_current_user(
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    user_update: UserUpdate,
+    current_user: UserRead = Depends(get_current_auth_user),
+):
+    user = await update_one_user(session=session, user_id=current_user.id, user_update=user_update)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
+@router.delete("/me", response_model=dict)
+async def delete_current_user(
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    current_user: UserRead = Depends(get_current_auth_user),
+):
+    if await delete_one_user(session=session, user_id=current_user.id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return {"detail": "User deleted successfully."}
@@ -0,0 +1,33 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.security.utils import get_authorization_scheme_param
+
+from app.core.config import settings
+from app.core.metrics import metrics_registry
+
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def get_metrics(request: Request):
+    """Метрики в текстовом формате Prometheus; только с `metrics.token`.
+
+    Значения относятся к процессу, принявшему запрос (см. `MetricsConfig`).
+    """
+    token = settings.metrics.token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, credentials = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not secrets.compare_digest(credentials.encode(), token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+router.add_api_route(settings.metrics.path, get_metrics, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.auth.utils import hash_password, validate_password
+from app.core.config import settings
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so a thread pool gives real parallelism. At most
+    `max_pending` operations may be queued or running; beyond that requests
+    are shed with 503 instead of piling up behind the pool. A slot is freed
+    when the bcrypt call itself ends, not when its caller gives up: a request
+    cancelled mid-hash still occupies a thread until bcrypt returns.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        # counters are updated from the worker threads as well as the event loop
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _timed(self, submitted_at: float, fn, *args):
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            wait = started_at - submitted_at
+            with self._lock:
+                self.queue_wait_seconds += wait
+                self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, wait)
+                self.hash_seconds += finished_at - started_at
+
+    def _release(self, future: Future) -> None:
+        # done callback: runs in the worker thread, or in the cancelling one if the call never started
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, retry later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            future = self.executor.submit(self._timed, time.perf_counter(), fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        # cancelling the awaiting task cancels the call only if it hasn't started yet
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_pwd: str | bytes) -> bool:
+        return await self._run(validate_password, password, hashed_pwd)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queue_wait_seconds_total": self.queue_wait_seconds,
+                "queue_wait_seconds_max": self.max_queue_wait_seconds,
+                "hash_seconds_total": self.hash_seconds,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hashing.max_workers,
+    max_pending=settings.password_hashing.max_pending,
+)
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from jwt import InvalidTokenError
+
+from app.core.config import settings
+
+
+DEFAULT_KID = "default"
+
+
+class _KeyFile:
+    """A PEM file parsed once and re-parsed only when its mtime changes."""
+
+    def __init__(self, path: Path | str, private: bool):
+        self.path = Path(path)
+        self.private = private
+        self._mtime: float | None = None
+        self._key: Any = None
+
+    def load(self, force: bool = False) -> Any:
+        mtime = os.stat(self.path).st_mtime
+        if force or self._key is None or mtime != self._mtime:
+            data = self.path.read_bytes()
+            if self.private:
+                self._key = serialization.load_pem_private_key(data, password=None)
+            else:
+                self._key = serialization.load_pem_public_key(data)
+            self._mtime = mtime
+        return self._key
+
+
+class JWTKeyManager:
+    """Keeps JWT signing/verification keys in memory.
+
+    The private key and every public key are parsed into `cryptography` key
+    objects once. Files are re-checked at most every `reload_interval`
+    seconds and re-parsed only when their mtime changed; `rotate()` forces a
+    reload. Several public keys may be active at once, selected by the `kid`
+    header of the token, so keys can be rotated without downtime.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path | str,
+        public_key_path: Path | str,
+        key_id: str | None = None,
+        extra_public_key_paths: dict[str, Path] | None = None,
+        reload_interval: float = 1.0,
+    ):
+        self.key_id = key_id
+        self.reload_interval = reload_interval
+        self._private = _KeyFile(private_key_path, private=True)
+        self._public: dict[str, _KeyFile] = {
+            kid: _KeyFile(path, private=False)
+            for kid, path in (extra_public_key_paths or {}).items()
+        }
+        self._public[key_id or DEFAULT_KID] = _KeyFile(public_key_path, private=False)
+        self._lock = threading.Lock()
+        self._checked_at: dict[str, float] = {}
+
+    def _get(self, name: str, key_file: _KeyFile) -> Any:
+        now = time.monotonic()
+        checked_at = self._checked_at.get(name)
+        if checked_at is not None and now - checked_at < self.reload_interval:
+            return key_file._key
+        with self._lock:
+            key = key_file.load()
+            self._checked_at[name] = now
+        return key
+
+    def signing_key(self) -> Any:
+        return self._get("private", self._private)
+
+    def verification_key(self, kid: str | None = None) -> Any:
+        if kid is None:
+            # tokens signed before a key id was configured carry none
+            kid = DEFAULT_KID if DEFAULT_KID in self._public else self.key_id or DEFAULT_KID
+        key_file = self._public.get(kid)
+        if key_file is None:
+            raise InvalidTokenError(f"Unknown key id: {kid}")
+        return self._get(f"public:{kid}", key_file)
+
+    def add_public_key(self, kid: str, path: Path | str) -> None:
+        """Register an additional verification key (e.g. the next key in a rotation)."""
+        with self._lock:
+            self._public[kid] = _KeyFile(path, private=False)
+            self._checked_at.pop(f"public:{kid}", None)
+
+    def remove_public_key(self, kid: str) -> None:
+        with self._lock:
+            self._public.pop(kid, None)
+            self._checked_at.pop(f"public:{kid}", None)
+
+    def rotate(
+        self,
+        private_key_path: Path | str | None = None,
+        key_id: str | None = None,
+        public_key_path: Path | str | None = None,
+    ) -> None:
+        """Reload all keys from disk, optionally switching to a new signing key.
+
+        `public_key_path` is registered under the new `key_id` (or the current
+        one). Public keys of earlier ids stay, so the tokens they signed keep
+        verifying until `remove_public_key()`.
+        """
+        with self._lock:
+            new_kid = key_id or self.key_id or DEFAULT_KID
+            if public_key_path is not None:
+                self._public[new_kid] = _KeyFile(public_key_path, private=False)
+            elif new_kid not in self._public:
+                raise ValueError(f"No public key for key id {new_kid!r}: pass public_key_path")
+            if private_key_path is not None:
+                self._private = _KeyFile(private_key_path, private=True)
+            if key_id is not None:
+                self.key_id = key_id
+            self._private.load(force=True)
+            for key_file in self._public.values():
+                key_file.load(force=True)
+            now = time.monotonic()
+            self._checked_at = {"private": now}
+            self._checked_at.update({f"public:{kid}": now for kid in self._public})
+
+
+key_manager = JWTKeyManager(
+    private_key_path=settings.auth_jwt.private_key_path,
+    public_key_path=settings.auth_jwt.public_key_path,
+    key_id=settings.auth_jwt.key_id,
+    extra_public_key_paths=settings.auth_jwt.extra_public_key_paths,
+    reload_interval=settings.auth_jwt.key_reload_interval,
+)
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class UserStateCache:
+    """Small TTL/LRU cache of user existence keyed by the token `sub`.
+
+    `True` means the user exists and is active, `False` means it was deleted
+    or revoked. Missing entries are resolved by the caller against the
+    database and stored with `set`.
+
+    The cache lives in process memory, so every worker has its own copy:
+    `invalidate`/`revoke` take effect at once only in the worker that
+    handled the update or delete; other workers see the change once their
+    entry expires after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sub: str) -> bool | None:
+        with self._lock:
+            item = self._data.get(sub)
+            if item is None:
+                return None
+            active, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[sub]
+                return None
+            self._data.move_to_end(sub)
+            return active
+
+    def set(self, sub: str, active: bool) -> None:
+        with self._lock:
+            self._data[sub] = (active, time.monotonic() + self.ttl)
+            self._data.move_to_end(sub)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, sub: str | int) -> None:
+        """Drop cached state after a user was changed, so the next request re-checks the DB."""
+        with self._lock:
+            self._data.pop(str(sub), None)
+
+    def revoke(self, sub: str | int) -> None:
+        """Reject tokens of a deleted user without waiting for the TTL."""
+        self.set(str(sub), False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+user_state_cache = UserStateCache(
+    maxsize=settings.auth_jwt.user_cache_size,
+    ttl=settings.auth_jwt.user_cache_ttl,
+)
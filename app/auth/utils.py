@@ -2,7 +2,7 @@ import jwt
 import bcrypt
 from app.core.config import settings
 from datetime import datetime, timedelta
-from pathlib import Path
+from app.auth.keys import key_manager
 
 def encode_jwt(
     payload: dict,
@@ -11,9 +11,11 @@ def encode_jwt(
     expire_minutes: int = settings.auth_jwt.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None
 ) -> str:
+    headers = None
     if key is None:
-        # support either Path or str values in settings
-        key = Path(settings.auth_jwt.private_key_path).read_text()
+        key = key_manager.signing_key()
+        if key_manager.key_id:
+            headers = {"kid": key_manager.key_id}
     to_encode = payload.copy()
     # ensure 'sub' claim is a string (some JWT libs require this)
     if 'sub' in to_encode and to_encode['sub'] is not None:
@@ -25,7 +27,7 @@ def encode_jwt(
         expire = now + timedelta(minutes=expire_minutes)
     to_encode.update(exp=expire, iat=now)
 
-    token = jwt.encode(to_encode, key, algorithm=algorithm)
+    token = jwt.encode(to_encode, key, algorithm=algorithm, headers=headers)
     return token
 
 
@@ -35,7 +37,8 @@ def decode_jwt(
     algorithms: list[str] | None = None
 ) -> dict:
     if public_key is None:
-        public_key = Path(settings.auth_jwt.public_key_path).read_text()
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = key_manager.verification_key(kid)
     if algorithms is None:
         algorithms = [settings.auth_jwt.algorithm]
     payload = jwt.decode(token, public_key, algorithms=algorithms)
@@ -0,0 +1,155 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Protocol
+
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisCacheBackend:
+    """Backend for any client with the redis.asyncio get/set/delete API."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        await self.client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+
+class ResponseCache:
+    """Per-scope cache of serialized responses with precise invalidation.
+
+    Every key contains the database version the response was built from
+    (e.g. the project's version counter), so an entry can only be found by
+    a request that saw the same version. That keeps per-worker in-process
+    caches correct with several workers, where invalidation reaches only
+    the worker that handled the write.
+
+    Keys also live under a scope (e.g. one user's project list) whose
+    current generation is part of the key. `invalidate` replaces the
+    generation, which makes all entries of the scope unreachable at once;
+    they then age out through TTL/LRU. A missing generation is always
+    replaced by a fresh one, so an evicted generation can't resurrect old
+    entries.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float = 30.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def _generation(self, scope: str) -> str:
+        gen_key = f"gen:{scope}"
+        generation = await self.backend.get(gen_key)
+        if generation is None:
+            generation = uuid.uuid4().hex.encode()
+            await self.backend.set(gen_key, generation)
+        return generation.decode() if isinstance(generation, bytes) else generation
+
+    async def lookup(self, scope: str, version, params: str) -> tuple[bytes | None, str | None]:
+        """Return `(cached value, key to store a fresh value under)` for data at `version`."""
+        if not self.enabled:
+            return None, None
+        key = f"resp:{scope}:{await self._generation(scope)}:{version}:{params}"
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value, key
+
+    async def store(self, key: str | None, value: bytes) -> None:
+        if key is not None:
+            await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, *scopes: str) -> None:
+        if not self.enabled:
+            return
+        for scope in scopes:
+            await self.backend.delete(f"gen:{scope}")
+            self.invalidations += 1
+
+    def metrics(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def projects_scope(user_id: int) -> str:
+    return f"projects:{user_id}"
+
+
+def tasks_scope(project_id: int) -> str:
+    return f"tasks:{project_id}"
+
+
+def _make_backend() -> CacheBackend | None:
+    if settings.cache.backend == "memory":
+        return MemoryCacheBackend(max_entries=settings.cache.max_entries)
+    if settings.cache.backend == "redis":
+        # imported only when configured: redis is optional and slow to import
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("cache.backend=redis requires the 'redis' package") from None
+        return RedisCacheBackend(redis.from_url(settings.cache.redis_url))
+    return None
+
+
+response_cache = ResponseCache(_make_backend(), ttl=settings.cache.ttl)
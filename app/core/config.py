@@ -2,21 +2,51 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import BaseModel
 from pydantic import PostgresDsn
 from pathlib import Path
+from typing import Literal
 
 class RunConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 8000
+    # worker processes of `python -m app.server`; 0 = one per CPU
+    workers: int = 0
+    backlog: int = 2048
+    timeout_keep_alive: int = 5
+    # connections per worker before new ones get 503
+    limit_concurrency: int | None = None
+    # seconds a worker waits for in-flight requests on SIGTERM
+    graceful_timeout: float = 30.0
+    # the server exits with status 1 when workers crash this many times within the window
+    max_worker_crashes: int = 5
+    crash_window_seconds: float = 60.0
+    # development only: single process with the auto-reloader
+    reload: bool = False
 
 
 class ApiPrefix(BaseModel):
     prefix: str = "/api"
+    # list endpoints select plain columns and encode them directly (orjson if installed)
+    fast_json: bool = False
 
 
 class DataBaseConfig(BaseModel):
     url: PostgresDsn
     echo: bool = False
-    echo_pool: int = 10
+    echo_pool: bool = False
+    pool_size: int = 5
     max_overflow: int = 10
+    # seconds to wait for a free connection before failing
+    pool_timeout: float = 30.0
+    # seconds after which a connection is replaced; -1 disables
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # asyncpg prepared statement cache; set 0 behind pgbouncer transaction pooling
+    statement_cache_size: int = 100
+    # connections opened at startup; 0 disables warm-up
+    pool_warmup: int = 5
+    # read-only replicas used by GET routes that opt in via read_session_getter
+    replica_urls: list[PostgresDsn] = []
+    # reads stay on the primary this long after the client's last write
+    read_your_writes_seconds: float = 5.0
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -31,6 +61,81 @@ class AuthJWT(BaseModel):
     public_key_path: Path = "jwt-public.pem"
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 60
+    # `kid` header written into issued tokens; None keeps tokens without it
+    key_id: str | None = None
+    # additional verification keys still accepted during a rotation: {kid: path}
+    extra_public_key_paths: dict[str, Path] = {}
+    # how often (seconds) key files are checked for changes on disk
+    key_reload_interval: float = 1.0
+    # build the current user from token claims instead of querying users table
+    stateless: bool = True
+    user_cache_size: int = 10_000
+    user_cache_ttl: float = 60.0
+
+class PasswordHashingConfig(BaseModel):
+    max_workers: int = 4
+    # queued + running bcrypt calls allowed before shedding with 503
+    max_pending: int = 64
+
+class CacheConfig(BaseModel):
+    # "redis" needs the redis package; "memory" is per worker, which is safe because
+    # entries are keyed on the data version, but each worker warms its own cache
+    backend: Literal["memory", "redis", "none"] = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    ttl: float = 30.0
+    max_entries: int = 10_000
+
+class RealtimeConfig(BaseModel):
+    # emit pg_notify from task writes and serve the SSE endpoint; off by default,
+    # since every task write then pays for the notification whether anyone listens or not
+    enabled: bool = False
+    # events buffered per client before it is told to resync
+    max_queue: int = 100
+    heartbeat_seconds: float = 15.0
+
+class StatsConfig(BaseModel):
+    # keep project_task_stats up to date on every task write and serve stats from it;
+    # after enabling it on an existing database, fill the table with `python -m app.rebuild_stats`
+    counters_table: bool = False
+
+class MetricsConfig(BaseModel):
+    # per-route query/latency instrumentation, the /metrics endpoint and Server-Timing
+    enabled: bool = True
+    server_timing: bool = True
+    path: str = "/metrics"
+    # scrapes must send `Authorization: Bearer <token>`; without a token /metrics answers 404.
+    # Values are per worker process: with run.workers > 1 a scrape sees the worker that
+    # accepted it, so scrape each worker separately (e.g. one worker per container)
+    token: str | None = None
+
+class RateLimit(BaseModel):
+    # sustained requests per second and the burst allowed on top
+    rate: float
+    burst: int
+
+class RateLimitConfig(BaseModel):
+    # token buckets per JWT `sub` (or client IP without a valid token)
+    enabled: bool = True
+    # "memory" keeps buckets per worker process, so with N workers (run.workers=0 means
+    # one per CPU) a client gets up to N times every limit; "redis" shares buckets
+    # between workers and needs the redis package
+    backend: Literal["memory", "redis"] = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    # for routes not listed in `routes`; all of them share one bucket per client
+    default: RateLimit = RateLimit(rate=50, burst=100)
+    # by "METHOD path template" (endpoint names aren't unique across routers);
+    # each gets its own bucket per client
+    routes: dict[str, RateLimit] = {
+        "POST /api/v1/auth/login": RateLimit(rate=0.2, burst=10),
+        "POST /api/v1/users": RateLimit(rate=0.05, burst=5),
+        "GET /api/v1/projects/{project_id}/tasks": RateLimit(rate=20, burst=40),
+        "POST /api/v1/projects/{project_id}/tasks:import": RateLimit(rate=0.1, burst=3),
+        "GET /api/v1/export": RateLimit(rate=0.1, burst=3),
+        "GET /api/v1/search": RateLimit(rate=5, burst=20),
+    }
+    # in-process backend: keys idle this long are dropped (their bucket is full again by then)
+    idle_seconds: float = 600.0
+    max_keys: int = 100_000
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -44,6 +149,12 @@ class Settings(BaseSettings):
     db: DataBaseConfig
 
     auth_jwt: AuthJWT = AuthJWT()
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
+    cache: CacheConfig = CacheConfig()
+    realtime: RealtimeConfig = RealtimeConfig()
+    stats: StatsConfig = StatsConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
 
 
 settings = Settings()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+logger = logging.getLogger(__name__)
+
+TASK_EVENTS_CHANNEL = "task_events"
+
+
+class Subscription:
+    """Bounded event queue of one client connection.
+
+    When the client falls behind and the queue fills up, pending events are
+    dropped and replaced by a single `resync` event telling it to refetch.
+    """
+
+    def __init__(self, project_id: int, max_queue: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+
+    def push(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"op": "resync", "project_id": self.project_id})
+
+
+class TaskEventHub:
+    """Fans out task change notifications from one LISTEN connection per worker.
+
+    The connection is opened on the first subscription. Notifications are
+    sent by the task write paths with `pg_notify` and delivered on commit.
+    """
+
+    def __init__(self, dsn: str, channel: str = TASK_EVENTS_CHANNEL, max_queue: int = 100):
+        self.dsn = dsn
+        self.channel = channel
+        self.max_queue = max_queue
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self._connection: "asyncpg.Connection | None" = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_listening(self) -> None:
+        # imported on first subscription, not when the app is imported
+        import asyncpg
+
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            self._connection = await asyncpg.connect(self.dsn)
+            self._connection.add_termination_listener(self._on_terminated)
+            await self._connection.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Malformed task event payload: %r", payload)
+            return
+        for subscription in tuple(self._subscriptions.get(event.get("project_id"), ())):
+            subscription.push(event)
+
+    def _on_terminated(self, connection) -> None:
+        # events may have been missed while disconnected
+        self._connection = None
+        for project_id, subscriptions in self._subscriptions.items():
+            for subscription in subscriptions:
+                subscription.push({"op": "resync", "project_id": project_id})
+        if self._subscriptions:
+            asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        import asyncpg
+
+        delay = 0.5
+        while self._subscriptions:
+            try:
+                await self._ensure_listening()
+                return
+            except (OSError, asyncpg.PostgresError):
+                logger.warning("Task event listener reconnect failed, retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def subscribe(self, project_id: int) -> Subscription:
+        await self._ensure_listening()
+        subscription = Subscription(project_id, self.max_queue)
+        self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.project_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.project_id]
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                connection, self._connection = self._connection, None
+                connection.remove_termination_listener(self._on_terminated)
+                await connection.close()
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+task_event_hub = TaskEventHub(
+    dsn=_asyncpg_dsn(str(settings.db.url)),
+    max_queue=settings.realtime.max_queue,
+)
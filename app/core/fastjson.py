@@ -0,0 +1,29 @@
+import json
+from datetime import datetime
+from typing import Iterable, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # "Z" for UTC, as orjson (OPT_UTC_Z) and pydantic write it
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Encode to JSON bytes with orjson when installed, the stdlib otherwise."""
+    if orjson is not None:
+        # OPT_UTC_Z matches pydantic's "Z" suffix for UTC datetimes
+        return orjson.dumps(obj, option=orjson.OPT_UTC_Z)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+def rows_to_dicts(rows: Iterable, fields: Sequence[str]) -> list[dict]:
+    """Turn selected column rows into dicts holding only `fields`, skipping model validation."""
+    return [{field: getattr(row, field) for field in fields} for row in rows]
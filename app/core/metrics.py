@@ -0,0 +1,231 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# upper bounds (seconds) of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_QUERY_STARTS = "metrics_query_starts"
+
+
+class RequestTimings:
+    """Time spent by one request outside the handler's own code."""
+
+    __slots__ = ("queries", "db_seconds", "pool_wait_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+# set by the middleware; SQLAlchemy runs cursor events in a greenlet that shares the task's context
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+
+class RouteStats:
+    """Running totals of one `(method, route)` pair."""
+
+    __slots__ = ("requests", "errors", "seconds", "queries", "db_seconds", "pool_wait_seconds", "serialize_seconds", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def observe(self, seconds: float, timings: RequestTimings, status: int) -> None:
+        self.requests += 1
+        if status >= 500:
+            self.errors += 1
+        self.seconds += seconds
+        self.queries += timings.queries
+        self.db_seconds += timings.db_seconds
+        self.pool_wait_seconds += timings.pool_wait_seconds
+        self.serialize_seconds += timings.serialize_seconds
+        self.buckets[bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+
+class MetricsRegistry:
+    """Per-route request metrics plus values collected on scrape.
+
+    Everything is updated from the event loop thread, so no locking is needed.
+    The registry belongs to one process; pre-forked workers each have their own.
+    """
+
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self._collectors: list[tuple[str, Callable[[], dict], frozenset[str]]] = []
+
+    def observe(self, method: str, route: str, seconds: float, timings: RequestTimings, status: int) -> None:
+        stats = self.routes.get((method, route))
+        if stats is None:
+            stats = self.routes[(method, route)] = RouteStats()
+        stats.observe(seconds, timings, status)
+
+    def add_collector(self, prefix: str, collect: Callable[[], dict], counters: Iterable[str] = ()) -> None:
+        """Export the numeric values of `collect()` as `app_<prefix>_<key>` on every scrape.
+
+        Keys listed in `counters` only ever grow and are exported as counters
+        named `app_<prefix>_<key>_total`; the others are gauges.
+        """
+        self._collectors.append((prefix, collect, frozenset(counters)))
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: list[str] = []
+        per_route = (
+            ("app_http_requests_total", "counter", "Requests handled", lambda s: s.requests),
+            ("app_http_server_errors_total", "counter", "Requests answered with 5xx", lambda s: s.errors),
+            ("app_db_queries_total", "counter", "SQL statements executed", lambda s: s.queries),
+            ("app_db_query_seconds_total", "counter", "Time spent executing SQL", lambda s: s.db_seconds),
+            ("app_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection", lambda s: s.pool_wait_seconds),
+            ("app_serialization_seconds_total", "counter", "Time spent encoding response bodies", lambda s: s.serialize_seconds),
+        )
+        for name, kind, help_text, value in per_route:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (method, route), stats in self.routes.items():
+                lines.append(f"{name}{{{_labels(method, route)}}} {value(stats)}")
+
+        name = "app_http_request_duration_seconds"
+        lines.append(f"# HELP {name} Time until the response is complete")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), stats in self.routes.items():
+            labels = _labels(method, route)
+            cumulative = 0
+            for bound, count in zip((*DURATION_BUCKETS, "+Inf"), stats.buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {stats.seconds}")
+            lines.append(f"{name}_count{{{labels}}} {stats.requests}")
+
+        for prefix, collect, counters in self._collectors:
+            for key, value in collect().items():
+                if not isinstance(value, (int, float)):
+                    continue
+                name = f"app_{prefix}_{key}"
+                if key in counters:
+                    name = name if name.endswith("_total") else f"{name}_total"
+                    lines.append(f"# TYPE {name} counter")
+                else:
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info[_QUERY_STARTS].pop()
+    timings = current_timings.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.db_seconds += time.perf_counter() - started_at
+
+
+def _handle_error(context):
+    # a failed statement gets no after_cursor_execute; drop its start time
+    if context.connection is not None and context.statement is not None:
+        starts = context.connection.info.get(_QUERY_STARTS)
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count statements and their execution time into the current request's timings."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def record_pool_wait(seconds: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+@contextmanager
+def serialization_timer():
+    """Attribute the enclosed block to the request's serialization time."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current_timings.get()
+        if timings is not None:
+            timings.serialize_seconds += time.perf_counter() - started_at
+
+
+def server_timing(timings: RequestTimings, handler_seconds: float) -> bytes:
+    return (
+        f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.queries} queries", '
+        f"pool;dur={timings.pool_wait_seconds * 1000:.2f}, "
+        f"serialize;dur={timings.serialize_seconds * 1000:.2f}, "
+        f"app;dur={handler_seconds * 1000:.2f}"
+    ).encode()
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware timing every HTTP request.
+
+    `Server-Timing` reflects the work done before the response headers are
+    sent; the per-route metrics are recorded once the response is complete,
+    so streaming responses include their whole body.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry, server_timing_header: bool = True, exclude: Iterable[str] = ()):
+        self.app = app
+        self.registry = registry
+        self.server_timing_header = server_timing_header
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started_at = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing_header:
+                    handler_seconds = time.perf_counter() - started_at
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"server-timing", server_timing(timings, handler_seconds)))
+                    message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+            # FastAPI stores the matched route in the scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.registry.observe(scope["method"], route, time.perf_counter() - started_at, timings, status)
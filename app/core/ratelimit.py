@@ -0,0 +1,163 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from app.core.config import RateLimit, settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; returns 0 if allowed, else seconds until a token is available."""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """Token buckets in a dict: one `(tokens, updated_at)` pair per active key.
+
+    Keys are kept in last-use order, so idle ones are evicted from the front
+    in amortized O(1) per call. A bucket idle for `idle_seconds` has refilled
+    completely, so dropping it loses nothing as long as `idle_seconds` is at
+    least `burst / rate` of every limit.
+    """
+
+    def __init__(self, idle_seconds: float = 600.0, max_keys: int = 100_000):
+        self.idle_seconds = idle_seconds
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = float(burst)
+        else:
+            tokens, updated_at = bucket
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._evict(now)
+        return retry_after
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        while buckets:
+            oldest_key = next(iter(buckets))
+            if len(buckets) <= self.max_keys and now - buckets[oldest_key][1] < self.idle_seconds:
+                break
+            del buckets[oldest_key]
+
+
+# atomic refill-and-take; the clock is Redis' own so workers agree on it
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets shared by all workers, stored as Redis hashes that expire once full."""
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        result = await self._take(keys=[self.prefix + key], args=[rate, burst])
+        return float(result)
+
+
+class RateLimiter:
+    """Per-route token buckets keyed by client identity.
+
+    Routes listed in `routes` get a bucket of their own per client; all
+    other routes share one bucket per client with the `default` limit.
+    A failing shared backend lets requests through rather than failing them.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        default: RateLimit,
+        routes: dict[str, RateLimit] | None = None,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.default = default
+        self.routes = routes or {}
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = 0
+        self.backend_errors = 0
+
+    async def check(self, route: str, identity: str) -> float:
+        """Returns 0 if the request may proceed, else the seconds to wait."""
+        limit = self.routes.get(route)
+        bucket = f"{route}:{identity}" if limit is not None else f"*:{identity}"
+        limit = limit or self.default
+        try:
+            retry_after = await self.backend.take(bucket, limit.rate, limit.burst)
+        except Exception:
+            self.backend_errors += 1
+            logger.warning("Rate limit backend failed, allowing request", exc_info=True)
+            return 0.0
+        if retry_after:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def metrics(self) -> dict:
+        metrics = {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "backend_errors": self.backend_errors,
+        }
+        if isinstance(self.backend, MemoryRateLimitBackend):
+            metrics["keys"] = len(self.backend)
+        return metrics
+
+
+def _make_backend() -> RateLimitBackend:
+    config = settings.rate_limit
+    if config.backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("rate_limit.backend=redis requires the 'redis' package") from None
+        return RedisRateLimitBackend(redis.from_url(config.redis_url))
+    return MemoryRateLimitBackend(idle_seconds=config.idle_seconds, max_keys=config.max_keys)
+
+
+rate_limiter = RateLimiter(
+    _make_backend(),
+    default=settings.rate_limit.default,
+    routes=settings.rate_limit.routes,
+    enabled=settings.rate_limit.enabled,
+)
@@ -0,0 +1,43 @@
+import re
+import subprocess
+import sys
+from typing import NamedTuple
+
+
+_IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str = "app.main") -> list[ImportTiming]:
+    """Import `module` in a fresh interpreter under `-X importtime` and parse the report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def format_import_report(timings: list[ImportTiming], top: int = 25) -> str:
+    """Total import time plus the `top` slowest top-level packages and modules."""
+    total_us = sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+    lines = [f"total import time: {total_us / 1000:.1f} ms", "", f"{'cumulative ms':>14} {'self ms':>9}  module"]
+    for timing in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{timing.cumulative_us / 1000:14.1f} {timing.self_us / 1000:9.1f}  {'  ' * timing.depth}{timing.module}"
+        )
+    return "\n".join(lines)
@@ -1,4 +1,3 @@
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -7,15 +6,26 @@ from app.core.config import settings
 from contextlib import asynccontextmanager
 
 from app.models import db_helper, Base
+from app.models.db_helper import LAST_WRITE_HEADER
 from app.api import router as api_roter
+from app.api.metrics import router as metrics_router
+from app.auth.hashing import password_hasher
+from app.core.cache import response_cache
+from app.core.events import task_event_hub
+from app.core.metrics import MetricsMiddleware, metrics_registry
+from app.core.ratelimit import rate_limiter
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # start  # только создание
+    # start
+    db_helper.start()
+    await db_helper.warm_up(settings.db.pool_warmup)
     yield
     # shutdown
     await db_helper.dispose()
+    password_hasher.shutdown()
+    await task_event_hub.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -27,11 +37,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER, "ETag", "Server-Timing", "Retry-After"],
 )
 
+if settings.metrics.enabled:
+    app.add_middleware(
+        MetricsMiddleware,
+        server_timing_header=settings.metrics.server_timing,
+        exclude=[settings.metrics.path],
+    )
+    metrics_registry.add_collector("db_pool", db_helper.pool_metrics, counters=("checkouts", "wait_seconds_total"))
+    metrics_registry.add_collector(
+        "password_hashing",
+        password_hasher.metrics,
+        counters=("completed", "failed", "rejected", "queue_wait_seconds_total", "hash_seconds_total"),
+    )
+    metrics_registry.add_collector("response_cache", response_cache.metrics, counters=("hits", "misses", "invalidations"))
+    metrics_registry.add_collector("rate_limit", rate_limiter.metrics, counters=("allowed", "rejected", "backend_errors"))
+    app.include_router(metrics_router)
+
 app.include_router(prefix=settings.api.prefix, router=api_roter)
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app", host=settings.run.host, port=settings.run.port, reload=True
-    )
+    from app.server import run
+
+    run(app)
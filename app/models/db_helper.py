@@ -1,5 +1,50 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import asyncio
+import itertools
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import instrument_engine, record_pool_wait
+
+
+class PoolStats:
+    """Connection checkout counters shared by a pool and its recreations."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, stats: PoolStats | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait = time.perf_counter() - started_at
+            self.stats.checkouts += 1
+            self.stats.wait_seconds += wait
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+            record_pool_wait(wait)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+LAST_WRITE_COOKIE = "db_last_write"
+LAST_WRITE_HEADER = "X-DB-Last-Write"
 
 
 class DatabaseHelper:
@@ -11,29 +56,175 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        statement_cache_size: int = 100,
+        replica_urls: list[str] | None = None,
+        read_your_writes_seconds: float = 5.0,
+        instrument: bool = False,
     ):
-        self.engine = create_async_engine(
-            url=url,
+        self.url = url
+        self.replica_urls = list(replica_urls or [])
+        self.pool_size = pool_size
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.instrument = instrument
+        self.engine_kwargs = dict(
             echo=echo,
             echo_pool=echo_pool,
+            poolclass=TimedQueuePool,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args={
+                # SQLAlchemy's prepared statement cache and asyncpg's own one
+                "prepared_statement_cache_size": statement_cache_size,
+                "statement_cache_size": statement_cache_size,
+            },
         )
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker | None = None
+        self._replica_engines: list[AsyncEngine] = []
+        self._replica_factories = None
+
+    def start(self) -> None:
+        """Create the engines (idempotent).
+
+        Deferred from import to the app's lifespan (or first use), so importing
+        the app does not load the driver, and forked workers build their own pools.
+        """
+        if self._engine is not None:
+            return
+        engine = create_async_engine(url=self.url, **self.engine_kwargs)
+        self._replica_engines = [
+            create_async_engine(url=replica_url, **self.engine_kwargs)
+            for replica_url in self.replica_urls
+        ]
+        if self.instrument:
+            for each in (engine, *self._replica_engines):
+                instrument_engine(each)
+        self._session_factory = self._make_session_factory(engine)
+        self._replica_factories = itertools.cycle(
+            [self._make_session_factory(replica) for replica in self._replica_engines]
+            or [self._session_factory]
+        )
+        self._engine = engine
+
+    @property
+    def engine(self) -> AsyncEngine:
+        self.start()
+        return self._engine
+
+    @property
+    def session_factory(self) -> async_sessionmaker:
+        self.start()
+        return self._session_factory
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        self.start()
+        return self._replica_engines
+
+    @staticmethod
+    def _make_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
+    def reset_after_fork(self) -> None:
+        """Drop pooled connections inherited from the parent process without closing them."""
+        if self._engine is None:
+            return
+        for engine in (self._engine, *self._replica_engines):
+            engine.sync_engine.dispose(close=False)
+
     async def dispose(self) -> None:
-        await self.engine.dispose()
+        if self._engine is None:
+            return
+        await self._engine.dispose()
+        for engine in self._replica_engines:
+            await engine.dispose()
 
-    async def session_getter(self):
+    async def session_getter(self, response: Response):
         async with self.session_factory() as session:
+            if self.replica_engines:
+                # mark the client as a recent writer so its reads stay on the primary
+                @event.listens_for(session.sync_session, "after_commit")
+                def _mark_write(_session):
+                    stamp = f"{time.time():.3f}"
+                    response.set_cookie(
+                        LAST_WRITE_COOKIE,
+                        stamp,
+                        max_age=int(self.read_your_writes_seconds) + 1,
+                        httponly=True,
+                    )
+                    response.headers[LAST_WRITE_HEADER] = stamp
+
+            yield session
+
+    def _recently_wrote(self, request: Request) -> bool:
+        stamp = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+        try:
+            return time.time() - float(stamp) < self.read_your_writes_seconds
+        except (TypeError, ValueError):
+            return False
+
+    async def read_session_getter(self, request: Request):
+        """Session for read-only routes: a replica, or the primary right after this client wrote."""
+        if not self.replica_engines or self._recently_wrote(request):
+            factory = self.session_factory
+        else:
+            factory = next(self._replica_factories)
+        async with factory() as session:
             yield session
 
+    async def warm_up(self, connections: int | None = None) -> None:
+        """Open `connections` (default: pool_size) connections per engine so the first requests don't pay for connecting."""
+        if connections is None:
+            connections = self.pool_size
+        count = min(connections, self.pool_size)
+        if count <= 0:
+            return
+        for engine in (self.engine, *self.replica_engines):
+            # wait for every attempt, so a failed one doesn't leave the others checked out
+            results = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+            for result in results:
+                if not isinstance(result, BaseException):
+                    await result.close()
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    def pool_metrics(self, engine: AsyncEngine | None = None) -> dict:
+        pool = (engine or self.engine).pool
+        stats = getattr(pool, "stats", PoolStats())
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": stats.checkouts,
+            "wait_seconds_total": stats.wait_seconds,
+            "wait_seconds_max": stats.max_wait_seconds,
+        }
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
+    echo=settings.db.echo,
+    echo_pool=settings.db.echo_pool,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    statement_cache_size=settings.db.statement_cache_size,
+    replica_urls=[str(url) for url in settings.db.replica_urls],
+    read_your_writes_seconds=settings.db.read_your_writes_seconds,
+    instrument=settings.metrics.enabled,
 )
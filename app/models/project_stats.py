@@ -0,0 +1,23 @@
+from app.models.base import Base
+from sqlalchemy.orm import mapped_column, Mapped
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, Integer, ForeignKey
+
+
+class ProjectTaskStats(Base):
+    """Per-project task counters, refreshed by the task write paths when enabled."""
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    urgent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    high: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    normal: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
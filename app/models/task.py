@@ -1,7 +1,8 @@
 from app.models.base import Base
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from datetime import datetime, timezone
-from sqlalchemy import String, DateTime, Integer, ForeignKey
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -9,8 +10,32 @@ if TYPE_CHECKING:
     from app.models.project import Project
 
 
+# priority values from most to least urgent; anything else sorts last
+PRIORITY_ORDER = ("urgent", "high", "normal", "low")
+
+
+def priority_rank_sql(column: str = "priority") -> str:
+    """SQL rank of a priority; queries must use the same expression as the index to hit it."""
+    whens = " ".join(f"WHEN {column} = '{value}' THEN {rank}" for rank, value in enumerate(PRIORITY_ORDER))
+    return f"(CASE {whens} ELSE {len(PRIORITY_ORDER)} END)"
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_project_id_deadline_id", "project_id", "deadline", "id"),
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_project_id_priority_rank_id", "project_id", text(priority_rank_sql()), "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_open_project_id_deadline",
+            "project_id",
+            "deadline",
+            postgresql_where=text("status <> 'completed'"),
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False
@@ -34,6 +59,15 @@ class Task(Base):
     completed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # maintained by Postgres; deferred so regular task loads don't fetch it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # relationships
     user: Mapped["User"] = relationship("User", back_populates="tasks")
@@ -0,0 +1,39 @@
+"""Recount project_task_stats from the tasks table: ``python -m app.rebuild_stats``.
+
+Task writes keep the counters current with increments, so this full
+aggregate is only needed after enabling `stats.counters_table` on an
+existing database, or to repair counters that drifted (e.g. after
+manual SQL). Run it while no task writes are in flight.
+"""
+import argparse
+import asyncio
+
+from app.api.api_v1.crud.stats import rebuild_project_stats
+from app.models import db_helper
+
+
+async def rebuild(project_ids: list[int] | None = None) -> int:
+    try:
+        async with db_helper.session_factory() as session:
+            return await rebuild_project_stats(session, project_ids)
+    finally:
+        await db_helper.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Recount project_task_stats from the tasks table.")
+    parser.add_argument(
+        "--project",
+        type=int,
+        action="append",
+        dest="project_ids",
+        metavar="ID",
+        help="only this project (repeatable); all projects by default",
+    )
+    args = parser.parse_args(argv)
+    count = asyncio.run(rebuild(args.project_ids))
+    print(f"rebuilt stats for {count} projects")
+
+
+if __name__ == "__main__":
+    main()
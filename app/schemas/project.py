@@ -2,6 +2,11 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.task import TaskRead
+
+# upper bound for `tasks_limit` of GET /projects?include=tasks
+MAX_EMBEDDED_TASKS = 50
+
 
 class ProjectBase(BaseModel):
     name: str
@@ -22,3 +27,21 @@ class Project(ProjectBase):
     user_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int
+    done: int
+    overdue: int
+    by_priority: dict[str, int]
+
+
+class ProjectTaskCounts(ProjectRead):
+    task_count: int
+    open_task_count: int
+
+
+class ProjectWithTasks(ProjectRead):
+    open_task_count: int
+    tasks: list[TaskRead]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from app.schemas.project import ProjectRead
+from app.schemas.task import TaskRead
+
+
+class TaskSearchHit(TaskRead):
+    project_id: int
+    rank: float
+
+
+class ProjectSearchHit(ProjectRead):
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    tasks: list[TaskSearchHit] = []
+    projects: list[ProjectSearchHit] = []
@@ -1,13 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Literal
+
+MAX_BATCH_OPERATIONS = 10_000
+# lengths of the tasks columns, so oversized values fail validation and not the INSERT/COPY
+TITLE_MAX_LENGTH = 100
+DESCRIPTION_MAX_LENGTH = 250
+STATUS_MAX_LENGTH = 50
 
 
 class TaskBase(BaseModel):
-    title: str
-    description: str | None = None
-    status: str = "pending"
-    priority: str = "normal"
+    title: str = Field(max_length=TITLE_MAX_LENGTH)
+    description: str | None = Field(None, max_length=DESCRIPTION_MAX_LENGTH)
+    status: str = Field("pending", max_length=STATUS_MAX_LENGTH)
+    priority: str = Field("normal", max_length=STATUS_MAX_LENGTH)
     deadline: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
@@ -19,10 +25,10 @@ class TaskCreate(TaskBase):
 
 
 class TaskUpdate(BaseModel):
-    title: Optional[str] = None
-    description: Optional[str] = None
-    status: Optional[str] = None
-    priority: Optional[str] = None
+    title: Optional[str] = Field(None, max_length=TITLE_MAX_LENGTH)
+    description: Optional[str] = Field(None, max_length=DESCRIPTION_MAX_LENGTH)
+    status: Optional[str] = Field(None, max_length=STATUS_MAX_LENGTH)
+    priority: Optional[str] = Field(None, max_length=STATUS_MAX_LENGTH)
     deadline: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
@@ -33,6 +39,56 @@ class TaskRead(TaskBase):
     id: int
 
 
+class TaskPage(BaseModel):
+    items: list[TaskRead]
+    next_cursor: Optional[str] = None
+
+
+class TaskFilters(BaseModel):
+    status: Optional[list[str]] = None
+    priority: Optional[list[str]] = None
+    deadline_from: Optional[datetime] = None
+    deadline_to: Optional[datetime] = None
+    overdue: Optional[bool] = None
+    completed: Optional[bool] = None
+
+
+class TaskBatchUpdate(TaskUpdate):
+    id: int
+
+
+class TaskBatchRequest(BaseModel):
+    create: list[TaskCreate] = Field(default_factory=list, max_length=MAX_BATCH_OPERATIONS)
+    update: list[TaskBatchUpdate] = Field(default_factory=list, max_length=MAX_BATCH_OPERATIONS)
+    delete: list[int] = Field(default_factory=list, max_length=MAX_BATCH_OPERATIONS)
+
+
+class TaskBatchResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    # position of the operation inside its list in the request
+    index: int
+    status: int
+    id: Optional[int] = None
+    task: Optional[TaskRead] = None
+    detail: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: list[TaskBatchResult]
+
+
+class TaskImportError(BaseModel):
+    # 1-based number of the data row in the upload
+    row: int
+    errors: list[dict[str, Any]] | str
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+
+
 class Task(TaskBase):
     user_id: int
     project_id: int
@@ -1,12 +1,21 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, AfterValidator, WithJsonSchema
+from pydantic.networks import validate_email
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from app.schemas.project import ProjectRead
 from pydantic import ConfigDict
 
 
+def _normalize_email(value: str) -> str:
+    # same result as pydantic.EmailStr, but email-validator is imported on the first call, not at import
+    return validate_email(value)[1]
+
+
+LazyEmail = Annotated[str, AfterValidator(_normalize_email), WithJsonSchema({"type": "string", "format": "email"})]
+
+
 class UserBase(BaseModel):
-    email: EmailStr
+    email: LazyEmail
     name: str
 
     model_config = {"from_attributes": True}
@@ -17,13 +26,19 @@ class UserCreate(UserBase):
     password: str
 
 
+class UserUpdate(BaseModel):
+    email: LazyEmail | None = None
+    name: str | None = None
+    password: str | None = None
+
+
 class UserRead(UserBase):
     id: int
 
 
 class UserProfile(BaseModel):
     id: int
-    email: EmailStr
+    email: LazyEmail
     name: str
 
     model_config = {"from_attributes": True}
@@ -32,7 +47,7 @@ class UserProfile(BaseModel):
 class User(UserBase):
     model_config = ConfigDict(strict=True)
 
-    email: EmailStr
+    email: LazyEmail
     name: str 
     hashed_password: bytes
     projects: Optional[List[ProjectRead]] = None
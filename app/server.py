@@ -0,0 +1,257 @@
+"""Production entry point: ``python -m app.server``.
+
+The app is imported once in the parent process, the listening socket is
+bound there, and N workers are forked from it, so they share the import
+work and accept on the same socket. Each worker is a plain uvicorn
+server (uvloop/httptools when installed) with its own event loop,
+database pool and lifespan. SIGTERM/SIGINT are forwarded to the workers,
+which stop accepting, close idle keep-alive connections and finish
+in-flight requests for up to `graceful_timeout` seconds; the parent
+restarts workers that die unexpectedly, backing off while they keep
+crashing and exiting with status 1 when they crash `max_worker_crashes`
+times within `crash_window_seconds`.
+
+``python -m app.server --profile-startup [TOP]`` prints an import-time
+report of the app instead of serving.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+
+import uvicorn
+
+from app.core.config import RunConfig, settings
+from app.core.startup import format_import_report, profile_imports
+
+
+logger = logging.getLogger(__name__)
+
+# how long the parent waits past the graceful timeout before killing a worker
+KILL_GRACE_SECONDS = 5.0
+# delay before restarting crashed workers; doubles with every crash inside the crash window
+RESPAWN_DELAY_SECONDS = 1.0
+MAX_RESPAWN_DELAY_SECONDS = 30.0
+
+
+def worker_count(config: RunConfig) -> int:
+    return config.workers if config.workers > 0 else os.cpu_count() or 1
+
+
+def uvicorn_config(app, config: RunConfig) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=config.host,
+        port=config.port,
+        loop="auto",
+        http="auto",
+        backlog=config.backlog,
+        timeout_keep_alive=config.timeout_keep_alive,
+        limit_concurrency=config.limit_concurrency,
+        timeout_graceful_shutdown=config.graceful_timeout,
+        lifespan="on",
+    )
+
+
+def bind_socket(config: RunConfig) -> socket.socket:
+    family = socket.AF_INET6 if ":" in config.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((config.host, config.port))
+    sock.listen(config.backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks the workers and keeps `count` of them running until told to stop.
+
+    Workers that exit unexpectedly are restarted after a delay that doubles
+    with every crash inside `crash_window_seconds`. When `max_worker_crashes`
+    happen inside the window (e.g. a bad DSN makes every worker fail at
+    startup), the remaining workers are stopped and `run()` returns 1.
+    """
+
+    poll_interval = 0.2
+    respawn_delay = RESPAWN_DELAY_SECONDS
+    max_respawn_delay = MAX_RESPAWN_DELAY_SECONDS
+    kill_grace = KILL_GRACE_SECONDS
+
+    def __init__(self, app, config: RunConfig, count: int):
+        self.app = app
+        self.config = config
+        self.count = count
+        self.sock = bind_socket(config)
+        self.workers: set[int] = set()
+        self.stopping = False
+        self.crashes: deque[float] = deque()
+        self._respawn_at: float | None = None
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers.add(pid)
+            return
+        code = 1
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            code = self._worker_main()
+        finally:
+            # skip the parent's atexit handlers and buffered state inherited by fork
+            os._exit(code)
+
+    def _worker_main(self) -> int:
+        """Body of a forked worker; returns its exit code."""
+        from app.models import db_helper
+
+        db_helper.reset_after_fork()
+        server = uvicorn.Server(uvicorn_config(self.app, self.config))
+        try:
+            server.run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            return 1
+        return 0 if server.started else 1
+
+    def _stop(self, signum, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Received %s, draining %d workers", signal.Signals(signum).name, len(self.workers))
+        self._signal_workers(signal.SIGTERM)
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in self.workers:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _reap(self) -> int:
+        """Collect exited workers; returns how many exited."""
+        exited = 0
+        while self.workers:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                break
+            if pid == 0:
+                break
+            self.workers.discard(pid)
+            exited += 1
+        return exited
+
+    def _record_crashes(self, exited: int, now: float) -> bool:
+        """Count unexpected exits and schedule the respawn; False once crashing too often."""
+        self.crashes.extend([now] * exited)
+        while self.crashes and now - self.crashes[0] > self.config.crash_window_seconds:
+            self.crashes.popleft()
+        if len(self.crashes) >= self.config.max_worker_crashes:
+            return False
+        delay = min(self.respawn_delay * 2 ** (len(self.crashes) - 1), self.max_respawn_delay)
+        logger.warning("%d worker(s) exited unexpectedly, restarting in %.1fs", exited, delay)
+        self._respawn_at = now + delay
+        return True
+
+    def run(self) -> int:
+        """Serve until SIGTERM/SIGINT; returns the exit code for the process."""
+        previous = {signum: signal.signal(signum, self._stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        logger.info("Starting %d workers on %s:%d", self.count, self.config.host, self.config.port)
+        code = 0
+        try:
+            for _ in range(self.count):
+                self._spawn()
+            deadline = None
+            while self.workers or (not self.stopping and self._respawn_at is not None):
+                time.sleep(self.poll_interval)
+                exited = self._reap()
+                now = time.monotonic()
+                if not self.stopping:
+                    if exited and not self._record_crashes(exited, now):
+                        logger.error(
+                            "Workers crashed %d times within %.0fs, giving up",
+                            len(self.crashes),
+                            self.config.crash_window_seconds,
+                        )
+                        code = 1
+                        self._stop(signal.SIGTERM, None)
+                    elif self._respawn_at is not None and now >= self._respawn_at:
+                        self._respawn_at = None
+                        for _ in range(self.count - len(self.workers)):
+                            self._spawn()
+                    continue
+                self._respawn_at = None
+                if deadline is None:
+                    deadline = now + self.config.graceful_timeout + self.kill_grace
+                elif now > deadline:
+                    logger.warning("Killing %d workers that did not drain in time", len(self.workers))
+                    self._signal_workers(signal.SIGKILL)
+                    deadline = float("inf")
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            self.sock.close()
+        return code
+
+
+def run(app=None) -> None:
+    config = settings.run
+    if config.reload:
+        uvicorn.run("app.main:app", host=config.host, port=config.port, reload=True)
+        return
+    if app is None:
+        from app.main import app
+    count = worker_count(config)
+    if count > 1 and settings.rate_limit.enabled and settings.rate_limit.backend == "memory":
+        logger.warning(
+            "Rate limit buckets are per worker: with %d workers clients get up to %d times "
+            "the configured limits; set rate_limit.backend=redis to share them",
+            count,
+            count,
+        )
+    if count == 1:
+        server = uvicorn.Server(uvicorn_config(app, config))
+        server.run()
+        return
+    if not hasattr(os, "fork"):
+        # no pre-fork on this platform: let uvicorn spawn workers that import the app themselves
+        uvicorn.run(
+            "app.main:app",
+            host=config.host,
+            port=config.port,
+            workers=count,
+            backlog=config.backlog,
+            timeout_keep_alive=config.timeout_keep_alive,
+            limit_concurrency=config.limit_concurrency,
+            timeout_graceful_shutdown=config.graceful_timeout,
+        )
+        return
+    sys.exit(Supervisor(app, config, count).run())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API server.")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        type=int,
+        const=25,
+        metavar="TOP",
+        help="print where importing the app spends its time (slowest TOP modules) and exit",
+    )
+    args = parser.parse_args(argv)
+    if args.profile_startup is not None:
+        print(format_import_report(profile_imports("app.main"), top=args.profile_startup))
+        return
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: time from interpreter start to the first answered request.
+
+Each run starts a fresh interpreter that imports `app.main`, runs the
+lifespan startup (engine creation and pool warm-up, so Postgres must be
+reachable) and sends one request through `httpx.ASGITransport`. Exits
+with status 1 when the median total exceeds `--budget`, so it can guard
+against startup regressions in CI. For where import time goes, see
+``python -m app.server --profile-startup``.
+
+    python -m benchmarks.cold_start [--runs 5] [--budget 1.5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# runs in the child interpreter; the request needs no auth or database access
+PROBE = """
+import time
+started_at = time.perf_counter()
+import asyncio, json
+import httpx
+from app.main import app
+imported_at = time.perf_counter()
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        ready_at = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://cold-start") as client:
+            await client.get("/cold-start-probe")
+        return ready_at
+
+ready_at = asyncio.run(first_request())
+answered_at = time.perf_counter()
+print(json.dumps({
+    "import": imported_at - started_at,
+    "startup": ready_at - imported_at,
+    "first_request": answered_at - ready_at,
+    "total": answered_at - started_at,
+}))
+"""
+
+
+def measure() -> dict:
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"cold start probe failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int, budget: float) -> int:
+    samples = [measure() for _ in range(runs)]
+    for phase in ("import", "startup", "first_request", "total"):
+        median = statistics.median(sample[phase] for sample in samples)
+        print(f"{phase:>14}: {median * 1000:8.1f} ms (median of {runs})")
+    total = statistics.median(sample["total"] for sample in samples)
+    if total > budget:
+        print(f"over budget: {total:.3f}s > {budget:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.5, help="seconds, median total")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.budget))
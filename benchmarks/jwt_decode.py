@@ -0,0 +1,54 @@
+"""Micro-benchmark: JWT decode cost per request.
+
+Compares reading and parsing the PEM file on every call (the old
+`decode_jwt` behaviour) with the cached keys from `app.auth.keys`.
+
+    python -m benchmarks.jwt_decode [iterations]
+"""
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.auth.keys import JWTKeyManager
+
+
+def main(iterations: int = 2000) -> None:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with tempfile.TemporaryDirectory() as tmp:
+        private_path = Path(tmp) / "jwt-private.pem"
+        public_path = Path(tmp) / "jwt-public.pem"
+        private_path.write_bytes(
+            private.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        public_path.write_bytes(
+            private.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+        token = jwt.encode({"sub": "1"}, private, algorithm="RS256")
+        manager = JWTKeyManager(private_path, public_path)
+
+        def before():
+            jwt.decode(token, public_path.read_text(), algorithms=["RS256"])
+
+        def after():
+            kid = jwt.get_unverified_header(token).get("kid")
+            jwt.decode(token, manager.verification_key(kid), algorithms=["RS256"])
+
+        for name, fn in (("read per request", before), ("cached key", after)):
+            seconds = timeit.timeit(fn, number=iterations)
+            print(f"{name:>16}: {seconds / iterations * 1e6:8.1f} us/decode")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,60 @@
+"""Benchmark: serializing a 5,000-task listing.
+
+Compares the default path (per-row `TaskRead` validation from ORM-like
+objects, then pydantic JSON) with the `api.fast_json` path (plain column
+rows encoded directly). Endpoint-level requests/second are measured by
+`benchmarks.load_test`; this isolates the CPU cost per response.
+
+    python -m benchmarks.list_serialization [tasks] [iterations]
+"""
+import sys
+import timeit
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core import fastjson
+from app.schemas.task import TaskRead
+
+FIELDS = tuple(TaskRead.model_fields)
+Row = namedtuple("Row", FIELDS)
+
+
+def make_rows(count: int) -> list[Row]:
+    now = datetime.now(timezone.utc)
+    return [
+        Row(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet" * 3,
+            status="pending" if i % 3 else "completed",
+            priority=("high", "normal", "low")[i % 3],
+            deadline=now + timedelta(days=i % 30),
+            completed_at=None if i % 3 else now,
+        )
+        for i in range(count)
+    ]
+
+
+def main(count: int = 5000, iterations: int = 20) -> None:
+    rows = make_rows(count)
+    objects = [SimpleNamespace(**row._asdict()) for row in rows]
+    adapter = TypeAdapter(list[TaskRead])
+
+    def pydantic_path():
+        adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+    def fast_path():
+        fastjson.dumps(fastjson.rows_to_dicts(rows, FIELDS))
+
+    encoder = "orjson" if fastjson.orjson is not None else "stdlib json"
+    for name, fn in (("pydantic", pydantic_path), (f"fast ({encoder})", fast_path)):
+        seconds = timeit.timeit(fn, number=iterations) / iterations
+        print(f"{name:>20}: {seconds * 1000:8.2f} ms/response  ~{1 / seconds:8.1f} responses/s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,341 @@
+"""Load test: concurrent requests against the real API routers.
+
+Seeds the configured Postgres (APP_CONFIG__DB__URL) with a synthetic
+dataset of users x projects x tasks through the models in `app.models`,
+then runs each scenario with `--concurrency` concurrent clients and
+reports throughput and p50/p95/p99 latency per endpoint. By default
+requests go through `httpx.ASGITransport` to the app in this process;
+`--base-url` targets a running server instead (e.g. to include uvicorn).
+
+Scenarios: login, list_projects, list_tasks, login_storm, create, patch,
+delete. `login_storm` runs logins from half of the clients while the
+other half keeps reading (list_projects and list_tasks in turn) until
+the logins are done; its reads' p99 next to the plain list_* ones shows
+whether password hashing slows down unrelated requests. `create`,
+`patch` and `delete` work on the same tasks, so the dataset size is
+unchanged afterwards. Seeded rows are removed unless `--keep`.
+
+The dataset is generated from `--seed`, so runs with the same options
+are comparable; every run still gets unique e-mail addresses.
+Rate limiting is switched off for the in-process app unless
+`--rate-limit` is given; disable it on a target server with
+APP_CONFIG__RATE_LIMIT__ENABLED=false.
+
+Results are written as JSON; pass an earlier file as `--baseline` to
+print the change per endpoint:
+
+    python -m benchmarks.load_test --users 20 --projects 5 --tasks 200 \\
+        --requests 2000 --concurrency 32 --output before.json
+    python -m benchmarks.load_test ... --baseline before.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import delete, insert
+
+from app.auth.utils import hash_password
+from app.core.config import settings
+from app.core.ratelimit import rate_limiter
+from app.main import app
+from app.models import Project, Task, User, db_helper
+from app.models.task import PRIORITY_ORDER
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = ("login", "list_projects", "list_tasks", "login_storm", "create", "patch", "delete")
+PASSWORD = "bench-password"
+INSERT_CHUNK_SIZE = 5000
+
+
+async def seed(run_id: str, users: int, projects: int, tasks: int, rng_seed: int) -> list[dict]:
+    """Insert the dataset; returns `{"id", "email", "projects"}` per user.
+
+    `rng_seed` fixes the generated values; `run_id` only keeps e-mails unique.
+    """
+    hashed = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    rng = random.Random(rng_seed)
+    async with db_helper.session_factory() as session:
+        user_ids = (
+            await session.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                [
+                    {"email": f"bench-{run_id}-{i}@example.com", "name": f"Bench {i}", "hashed_password": hashed}
+                    for i in range(users)
+                ],
+            )
+        ).all()
+        project_rows = [
+            {"user_id": user_id, "name": f"Project {p}", "description": "load test"}
+            for user_id in user_ids
+            for p in range(projects)
+        ]
+        project_ids = (
+            await session.scalars(
+                insert(Project).returning(Project.id, sort_by_parameter_order=True), project_rows
+            )
+        ).all()
+        task_rows = [
+            {
+                "user_id": row["user_id"],
+                "project_id": project_id,
+                "title": f"Task {t}",
+                "description": "synthetic task",
+                "status": "completed" if t % 4 == 0 else "pending",
+                "priority": PRIORITY_ORDER[t % len(PRIORITY_ORDER)],
+                "deadline": now + timedelta(days=rng.randint(-10, 30)),
+            }
+            for row, project_id in zip(project_rows, project_ids)
+            for t in range(tasks)
+        ]
+        for start in range(0, len(task_rows), INSERT_CHUNK_SIZE):
+            await session.execute(insert(Task), task_rows[start:start + INSERT_CHUNK_SIZE])
+        await session.commit()
+    by_user: dict[int, list[int]] = {user_id: [] for user_id in user_ids}
+    for row, project_id in zip(project_rows, project_ids):
+        by_user[row["user_id"]].append(project_id)
+    return [
+        {"id": user_id, "email": f"bench-{run_id}-{i}@example.com", "projects": by_user[user_id]}
+        for i, user_id in enumerate(user_ids)
+    ]
+
+
+async def cleanup(user_ids: list[int]) -> None:
+    async with db_helper.session_factory() as session:
+        await session.execute(delete(Task).where(Task.user_id.in_(user_ids)))
+        await session.execute(delete(Project).where(Project.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(ordered) / seconds, 1) if seconds else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+    }
+
+
+async def run_scenario(
+    requests: int | None, concurrency: int, make_request, until: asyncio.Future | None = None
+) -> dict:
+    """Closed loop: `concurrency` workers issue `requests` calls in total.
+
+    With `requests=None` they keep going until `until` is done instead.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests)) if requests is not None else itertools.count()
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            if until is not None and until.done():
+                break
+            started_at = time.perf_counter()
+            try:
+                response = await make_request(index)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started_at)
+            if not ok:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started_at)
+
+
+async def drive(client: httpx.AsyncClient, users: list[dict], requests: int, concurrency: int) -> dict:
+    api = f"{settings.api.prefix}/v1"
+    tokens: dict[int, str] = {}
+    for user in users:
+        response = await client.post(f"{api}/auth/login", json={"email": user["email"], "password": PASSWORD})
+        response.raise_for_status()
+        tokens[user["id"]] = response.json()["access_token"]
+
+    def pick(index: int) -> tuple[dict, dict]:
+        user = users[index % len(users)]
+        return user, {"Authorization": f"Bearer {tokens[user['id']]}"}
+
+    # (project_id, task_id, headers) of tasks made by `create`, reused by `patch` and `delete`
+    created: list[tuple[int, int, dict]] = []
+
+    async def login(index):
+        user, _ = pick(index)
+        return await client.post(f"{api}/auth/login", json={"email": user["email"], "password": PASSWORD})
+
+    async def list_projects(index):
+        _, headers = pick(index)
+        return await client.get(f"{api}/projects", headers=headers)
+
+    async def list_tasks(index):
+        user, headers = pick(index)
+        project_id = user["projects"][index % len(user["projects"])]
+        return await client.get(f"{api}/projects/{project_id}/tasks", headers=headers)
+
+    async def read(index):
+        return await (list_projects if index % 2 else list_tasks)(index)
+
+    async def login_storm(count):
+        """Reads from half of the clients for as long as the other half logs in."""
+        logins = asyncio.ensure_future(run_scenario(count, max(1, concurrency // 2), login))
+        reads = await run_scenario(None, max(1, concurrency - concurrency // 2), read, until=logins)
+        return {"login_storm_logins": await logins, "login_storm_reads": reads}
+
+    async def create(index):
+        user, headers = pick(index)
+        project_id = user["projects"][index % len(user["projects"])]
+        response = await client.post(
+            f"{api}/projects/{project_id}/tasks",
+            json={"title": f"Load {index}", "priority": PRIORITY_ORDER[index % len(PRIORITY_ORDER)]},
+            headers=headers,
+        )
+        if response.status_code < 400:
+            created.append((project_id, response.json()["id"], headers))
+        return response
+
+    async def patch(index):
+        project_id, task_id, headers = created[index % len(created)]
+        return await client.patch(
+            f"{api}/projects/{project_id}/tasks/{task_id}", json={"status": "in_progress"}, headers=headers
+        )
+
+    async def delete_(index):
+        project_id, task_id, headers = created[index]
+        return await client.delete(f"{api}/projects/{project_id}/tasks/{task_id}", headers=headers)
+
+    handlers = {
+        "login": login,
+        "list_projects": list_projects,
+        "list_tasks": list_tasks,
+        "create": create,
+        "patch": patch,
+        "delete": delete_,
+    }
+    results = {}
+    for name in SCENARIOS:
+        count = requests
+        if name in ("patch", "delete"):
+            if not created:
+                continue
+            count = requests if name == "patch" else len(created)
+        if name == "login_storm":
+            scenario_results = await login_storm(count)
+        else:
+            scenario_results = {name: await run_scenario(count, concurrency, handlers[name])}
+        for result_name, result in scenario_results.items():
+            results[result_name] = result
+            print(
+                f"{result_name:>18}: {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+            )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())["results"]
+    print(f"\nchange vs {baseline_path} ({'throughput':>10}, p95):")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before or not before["throughput_rps"] or not before["p95_ms"]:
+            continue
+        throughput = (current["throughput_rps"] / before["throughput_rps"] - 1) * 100
+        p95 = (current["p95_ms"] / before["p95_ms"] - 1) * 100
+        print(f"{name:>18}: {throughput:+8.1f} %  {p95:+8.1f} %")
+
+
+async def main(args: argparse.Namespace) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    print(f"seeding {args.users} users x {args.projects} projects x {args.tasks} tasks ...")
+    users = await seed(run_id, args.users, args.projects, args.tasks, args.seed)
+    try:
+        if args.base_url:
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+                results = await drive(client, users, args.requests, args.concurrency)
+        else:
+            rate_limiter.enabled = args.rate_limit
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+                    results = await drive(client, users, args.requests, args.concurrency)
+    finally:
+        if not args.keep:
+            await cleanup([user["id"] for user in users])
+        await db_helper.dispose()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "users": args.users,
+            "projects": args.projects,
+            "tasks": args.tasks,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "target": args.base_url or "asgi",
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit or 'unknown'}-{int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nresults written to {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=5, help="projects per user")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks per project")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated dataset")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--base-url", help="running server to target instead of the in-process app")
+    parser.add_argument("--output", type=Path, help="JSON report path (default: benchmarks/results/)")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON report to compare with")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    parser.add_argument("--rate-limit", action="store_true", help="keep rate limiting on (in-process app)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,66 @@
+"""Micro-benchmark: cost of the metrics instrumentation.
+
+Times a trivial ASGI app called directly, bare and wrapped in
+`MetricsMiddleware` (with and without the Server-Timing header), and
+the cursor event listeners that run around every SQL statement. The
+differences are the per-request and per-statement overhead of
+`metrics.enabled`.
+
+    python -m benchmarks.metrics_overhead [iterations]
+"""
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, _after_cursor_execute, _before_cursor_execute
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/v1/projects", "headers": []}
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def time_requests(asgi_app, iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        await asgi_app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started_at) / iterations
+
+
+def time_statements(iterations: int) -> float:
+    conn = SimpleNamespace(info={})
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        _before_cursor_execute(conn, None, "SELECT 1", None, None, False)
+        _after_cursor_execute(conn, None, "SELECT 1", None, None, False)
+    return (time.perf_counter() - started_at) / iterations
+
+
+async def main(iterations: int) -> None:
+    variants = (
+        ("bare app", app),
+        ("metrics", MetricsMiddleware(app, MetricsRegistry(), server_timing_header=False)),
+        ("metrics+timing", MetricsMiddleware(app, MetricsRegistry(), server_timing_header=True)),
+    )
+    baseline = None
+    for name, asgi_app in variants:
+        await time_requests(asgi_app, iterations // 10)  # warm-up
+        seconds = await time_requests(asgi_app, iterations)
+        baseline = seconds if baseline is None else baseline
+        print(f"{name:>16}: {seconds * 1e6:8.2f} us/request  (+{(seconds - baseline) * 1e6:.2f} us)")
+    print(f"{'statement hooks':>16}: {time_statements(iterations) * 1e6:8.2f} us/statement")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -13,11 +13,22 @@ export const apiClient = {
       headers["Authorization"] = `Bearer ${token}`;
     }
 
+    // read-your-writes: keeps our reads on the primary DB right after a write
+    const lastWrite = sessionStorage.getItem("dbLastWrite");
+    if (lastWrite) {
+      headers["X-DB-Last-Write"] = lastWrite;
+    }
+
     const response = await fetch(url, {
       ...options,
       headers: { ...headers, ...(options.headers as Record<string, string>) },
     });
 
+    const writeStamp = response.headers.get("X-DB-Last-Write");
+    if (writeStamp) {
+      sessionStorage.setItem("dbLastWrite", writeStamp);
+    }
+
     if (!response.ok) {
       const error = await response.json();
       throw new Error(error.detail || `HTTP ${response.status}`);
@@ -79,6 +90,11 @@ export const projectsApi = {
     return apiClient.get("/projects");
   },
 
+  // top open tasks of every project in one request (include=task_counts for counts only)
+  getAllWithTasks(tasksLimit = 5) {
+    return apiClient.get(`/projects?include=tasks&tasks_limit=${tasksLimit}`);
+  },
+
   create(name: string, description: string) {
     return apiClient.post("/projects", { name, description });
   },
@@ -92,9 +108,13 @@ export const projectsApi = {
   },
 };
 
+export const TASKS_PAGE_SIZE = 100;
+
 export const tasksApi = {
-  getAll(projectId: number) {
-    return apiClient.get(`/projects/${projectId}/tasks`);
+  // one cursor page; pass the previous page's next_cursor to get the next one
+  getPage(projectId: number, cursor: string | null = null, limit = TASKS_PAGE_SIZE) {
+    const query = cursor ? `?limit=${limit}&cursor=${encodeURIComponent(cursor)}` : `?limit=${limit}`;
+    return apiClient.get(`/projects/${projectId}/tasks${query}`);
   },
 
   create(projectId: number, task: { title: string; description?: string; status?: string; priority?: string; deadline?: string }) {
@@ -108,6 +128,10 @@ export const tasksApi = {
   delete(projectId: number, taskId: number) {
     return apiClient.delete(`/projects/${projectId}/tasks/${taskId}`);
   },
+
+  batch(projectId: number, operations: { create?: any[]; update?: any[]; delete?: number[] }) {
+    return apiClient.post(`/projects/${projectId}/tasks:batch`, operations);
+  },
 };
 
 export const usersApi = {
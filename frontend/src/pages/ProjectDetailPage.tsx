@@ -65,7 +65,9 @@ export const ProjectDetailPage = () => {
   
   const [project, setProject] = useState<Project | null>(null);
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showModal, setShowModal] = useState(false);
   const [draggedTask, setDraggedTask] = useState<Task | null>(null);
   const [newTask, setNewTask] = useState({
@@ -93,10 +95,12 @@ export const ProjectDetailPage = () => {
     }
   };
 
+  // первая страница задач; следующие догружаются по кнопке
   const loadTasks = async () => {
     try {
-      const data = await tasksApi.getAll(Number(projectId));
-      setTasks(data);
+      const page = await tasksApi.getPage(Number(projectId));
+      setTasks(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       console.error(error);
     } finally {
@@ -104,6 +108,20 @@ export const ProjectDetailPage = () => {
     }
   };
 
+  const loadMoreTasks = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await tasksApi.getPage(Number(projectId), nextCursor);
+      setTasks((loaded) => [...loaded, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreateTask = async (e: React.FormEvent) => {
     e.preventDefault();
     try {
@@ -316,6 +334,14 @@ export const ProjectDetailPage = () => {
             </div>
           ))}
         </div>
+
+        {nextCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="secondary" onClick={loadMoreTasks} disabled={loadingMore}>
+              {loadingMore ? "Загрузка..." : "Загрузить ещё"}
+            </Button>
+          </div>
+        )}
       </main>
 
       {/* Модальное окно создания задачи */}
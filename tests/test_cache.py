@@ -0,0 +1,32 @@
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+async def test_entries_are_keyed_on_version():
+    cache = ResponseCache(MemoryCacheBackend())
+    cached, key = await cache.lookup("tasks:1", 1, "params")
+    assert cached is None
+    await cache.store(key, b"v1 body")
+
+    assert (await cache.lookup("tasks:1", 1, "params"))[0] == b"v1 body"
+    # a newer version misses even though nobody invalidated this cache (another worker wrote)
+    assert (await cache.lookup("tasks:1", 2, "params"))[0] is None
+
+
+async def test_invalidate_drops_the_scope_only(fake_redis):
+    cache = ResponseCache(RedisCacheBackend(fake_redis))
+    _, tasks_key = await cache.lookup("tasks:1", 1, "params")
+    _, other_key = await cache.lookup("tasks:2", 1, "params")
+    await cache.store(tasks_key, b"one")
+    await cache.store(other_key, b"two")
+
+    await cache.invalidate("tasks:1")
+
+    assert (await cache.lookup("tasks:1", 1, "params"))[0] is None
+    assert (await cache.lookup("tasks:2", 1, "params"))[0] == b"two"
+    assert cache.metrics() == {"hits": 1, "misses": 3, "invalidations": 1}
+
+
+async def test_disabled_cache_never_stores():
+    cache = ResponseCache(None)
+    assert await cache.lookup("tasks:1", 1, "params") == (None, None)
+    await cache.store(None, b"body")
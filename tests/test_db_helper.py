@@ -0,0 +1,48 @@
+import pytest
+
+from app.models.db_helper import DatabaseHelper
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def close(self):
+        self.engine.open -= 1
+
+
+class FakeEngine:
+    """`connect()` fails on the given attempt numbers and counts open connections."""
+
+    def __init__(self, failing: set[int]):
+        self.failing = failing
+        self.attempts = 0
+        self.open = 0
+
+    async def connect(self):
+        self.attempts += 1
+        if self.attempts in self.failing:
+            raise OSError("connection refused")
+        self.open += 1
+        return FakeConnection(self)
+
+
+def _helper(engine: FakeEngine) -> DatabaseHelper:
+    helper = DatabaseHelper(url="postgresql+asyncpg://test/test", pool_size=4)
+    helper._engine = engine
+    return helper
+
+
+async def test_warm_up_closes_opened_connections_when_one_fails():
+    engine = FakeEngine(failing={2})
+    with pytest.raises(OSError):
+        await _helper(engine).warm_up()
+    assert engine.attempts == 4
+    assert engine.open == 0
+
+
+async def test_warm_up_opens_pool_size_connections():
+    engine = FakeEngine(failing=set())
+    await _helper(engine).warm_up(10)
+    assert engine.attempts == 4
+    assert engine.open == 0
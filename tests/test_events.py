@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+import uvicorn
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.events import Subscription, TaskEventHub, _asyncpg_dsn
+
+
+async def _until(condition, timeout: float = 10.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not reached"
+        await asyncio.sleep(0.02)
+
+
+def _drain(subscription: Subscription) -> list[dict]:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_overflow_replaces_the_backlog_with_resync():
+    subscription = Subscription(project_id=7, max_queue=2)
+    subscription.push({"op": "create", "project_id": 7, "id": 1})
+    subscription.push({"op": "create", "project_id": 7, "id": 2})
+    assert subscription.queue.full()
+
+    subscription.push({"op": "create", "project_id": 7, "id": 3})
+    assert _drain(subscription) == [{"op": "resync", "project_id": 7}]
+
+    # the queue accepts events again once the client has read the resync
+    subscription.push({"op": "delete", "project_id": 7, "id": 1})
+    assert _drain(subscription) == [{"op": "delete", "project_id": 7, "id": 1}]
+
+
+@pytest.fixture
+async def hub(clean_database):
+    hub = TaskEventHub(dsn=_asyncpg_dsn(str(settings.db.url)), max_queue=10)
+    yield hub
+    for subscriptions in list(hub._subscriptions.values()):
+        for subscription in list(subscriptions):
+            hub.unsubscribe(subscription)
+    await hub.close()
+
+
+async def _notify(session, event: dict) -> None:
+    await session.execute(text("SELECT pg_notify('task_events', :payload)"), {"payload": json.dumps(event)})
+    await session.commit()
+
+
+@pytest.mark.postgres
+async def test_notifications_reach_the_project_subscribers(hub, session):
+    subscription = await hub.subscribe(1)
+    other = await hub.subscribe(2)
+    await _notify(session, {"op": "create", "project_id": 1, "task": {"id": 5}})
+    await _until(lambda: not subscription.queue.empty())
+    assert _drain(subscription) == [{"op": "create", "project_id": 1, "task": {"id": 5}}]
+    assert other.queue.empty()
+
+
+@pytest.mark.postgres
+async def test_lost_listener_resyncs_and_reconnects(hub, session):
+    subscription = await hub.subscribe(1)
+    old_connection = hub._connection
+    await session.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": old_connection.get_server_pid()})
+    await session.commit()
+
+    await _until(lambda: not subscription.queue.empty())
+    assert _drain(subscription) == [{"op": "resync", "project_id": 1}]
+    await _until(lambda: hub._connection is not None and hub._connection is not old_connection)
+
+    await _notify(session, {"op": "update", "project_id": 1})
+    await _until(lambda: not subscription.queue.empty())
+    assert _drain(subscription) == [{"op": "update", "project_id": 1}]
+
+
+@pytest.fixture
+async def live_server(clean_database, monkeypatch):
+    """The app behind a real uvicorn server: ASGITransport buffers whole responses, SSE never ends."""
+    from app.core.events import task_event_hub
+    from app.main import app
+
+    monkeypatch.setattr(settings.realtime, "enabled", True)
+    # the app's lifespan would dispose the engine shared with the other tests
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", ws="none", log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.ensure_future(server.serve())
+    await _until(lambda: server.started)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}{settings.api.prefix}/v1"
+    server.should_exit = True
+    await serving
+    await task_event_hub.close()
+
+
+@pytest.mark.postgres
+async def test_sse_stream_receives_the_event_after_commit(live_server, register):
+    async with httpx.AsyncClient(base_url=live_server, timeout=10) as client:
+        auth = await register(client, email="live@example.com", name="Live")
+        project_id = (await client.post("/projects", json={"name": "Live", "description": "sse"}, headers=auth)).json()["id"]
+        async with client.stream("GET", f"/projects/{project_id}/tasks/events", headers=auth) as stream:
+            assert stream.status_code == 200
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            lines = stream.aiter_lines()
+            assert await anext(lines) == "retry: 3000"
+
+            created = (await client.post(f"/projects/{project_id}/tasks", json={"title": "live"}, headers=auth)).json()
+            event_line, data_line = None, None
+            async for line in lines:
+                if line.startswith("event:"):
+                    event_line = line
+                elif line.startswith("data:"):
+                    data_line = line
+                    break
+    assert event_line == "event: create"
+    event = json.loads(data_line.removeprefix("data: "))
+    assert event["project_id"] == project_id
+    assert event["task"]["id"] == created["id"] and event["task"]["title"] == "live"
+
+
+@pytest.mark.postgres
+async def test_writes_do_not_notify_when_realtime_is_off(client, auth, project_id, queries):
+    assert not settings.realtime.enabled
+    queries.clear()
+    response = await client.post(f"/projects/{project_id}/tasks", json={"title": "quiet"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert not any("pg_notify" in statement for statement in queries), queries
+    response = await client.get(f"/projects/{project_id}/tasks/events", headers=auth)
+    assert response.status_code == 404
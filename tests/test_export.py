@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.api.api_v1.crud import export
+from app.api.api_v1.crud.export import EXPORT_FIELDS, stream_user_export
+
+pytestmark = pytest.mark.postgres
+
+
+async def _create_tasks(client, auth, project_id: int, count: int) -> list[int]:
+    batch = {"create": [{"title": f"task {n}", "description": f"about {n}"} for n in range(count)]}
+    response = await client.post(f"/projects/{project_id}/tasks:batch", json=batch, headers=auth)
+    assert response.status_code == 200, response.text
+    return [result["id"] for result in response.json()["results"]]
+
+
+async def _user_id(client, auth) -> int:
+    return (await client.get("/auth/users/me", headers=auth)).json()["id"]
+
+
+async def test_ndjson_export(client, auth, project_id):
+    task_ids = await _create_tasks(client, auth, project_id, 2)
+    response = await client.get("/export", headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["content-disposition"] == 'attachment; filename="export.ndjson"'
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["type"], r["id"]) for r in records] == [("project", project_id)] + [("task", i) for i in task_ids]
+    project, task = records[0], records[1]
+    assert project["name"] == "Test project" and project["description"] == "test"
+    assert task["project_id"] == project_id
+    assert task["name"] == "task 0" and task["description"] == "about 0"
+    assert task["status"] and task["priority"] and task["created_at"]
+
+
+async def test_csv_export(client, auth, project_id):
+    task_ids = await _create_tasks(client, auth, project_id, 2)
+    response = await client.get("/export", params={"format": "csv"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert tuple(reader.fieldnames) == EXPORT_FIELDS
+    rows = list(reader)
+    assert [(r["type"], int(r["id"])) for r in rows] == [("project", project_id)] + [("task", i) for i in task_ids]
+    assert rows[1]["project_id"] == str(project_id)
+    assert rows[0]["project_id"] == ""
+
+
+async def test_export_contains_only_the_users_data(client, register, auth, project_id):
+    await _create_tasks(client, auth, project_id, 3)
+    stranger = await register(client, email="stranger@example.com", name="Stranger")
+    response = await client.get("/export", headers=stranger)
+    assert response.status_code == 200, response.text
+    assert response.text == ""
+
+    response = await client.post("/projects", json={"name": "Mine", "description": "own"}, headers=stranger)
+    own_project = response.json()["id"]
+    records = [json.loads(line) for line in (await client.get("/export", headers=stranger)).text.splitlines()]
+    assert [(r["type"], r["id"]) for r in records] == [("project", own_project)]
+
+
+async def test_export_streams_in_batches(clean_database, client, auth, project_id, monkeypatch):
+    task_ids = await _create_tasks(client, auth, project_id, 10)
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 3)
+
+    chunks = [
+        chunk async for chunk in stream_user_export(clean_database.session_factory, await _user_id(client, auth))
+    ]
+    # one chunk for the project, then the 10 tasks in chunks of at most 3 rows
+    assert [chunk.count("\n") for chunk in chunks] == [1, 3, 3, 3, 1]
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [r["id"] for r in records if r["type"] == "task"] == task_ids
+
+    csv_chunks = [
+        chunk
+        async for chunk in stream_user_export(clean_database.session_factory, await _user_id(client, auth), fmt="csv")
+    ]
+    # the header comes first, on its own
+    assert [chunk.count("\n") for chunk in csv_chunks] == [1, 1, 3, 3, 3, 1]
+    assert len(list(csv.DictReader(io.StringIO("".join(csv_chunks))))) == 11
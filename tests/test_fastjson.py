@@ -0,0 +1,33 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import fastjson
+from app.schemas.task import TaskRead
+
+ROW = {
+    "id": 1,
+    "title": "task",
+    "description": None,
+    "status": "pending",
+    "priority": "normal",
+    "deadline": datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc),
+    "completed_at": datetime(2026, 3, 1, 12, 30, 0, 250, tzinfo=timezone(timedelta(hours=3))),
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    return request.param
+
+
+def test_matches_pydantic_serialization(backend):
+    expected = json.loads(TaskRead.model_validate(ROW).model_dump_json())
+    encoded = json.loads(fastjson.dumps(fastjson.rows_to_dicts([TaskRead.model_validate(ROW)], TaskRead.model_fields)))
+    assert encoded == [expected]
+    assert expected["deadline"] == "2026-03-01T12:30:00Z"
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.hashing import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    yield hasher
+    hasher.shutdown()
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+async def test_cancelled_call_holds_its_slot_until_the_thread_is_done(hasher):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "hash"
+
+    running = asyncio.create_task(hasher._run(slow))
+    await _until(started.is_set)
+    queued = asyncio.create_task(hasher._run(lambda: "never"))
+    await asyncio.sleep(0)
+
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    # the bcrypt thread is still busy, so its slot stays taken and the next call is shed
+    assert hasher.metrics()["pending"] == 2
+    with pytest.raises(HTTPException) as excinfo:
+        await hasher._run(lambda: "shed")
+    assert excinfo.value.status_code == 503
+
+    # a call still waiting in the queue is dropped, and frees its slot, right away
+    queued.cancel()
+    await _until(lambda: hasher.metrics()["pending"] == 1)
+
+    release.set()
+    await _until(lambda: hasher.metrics()["pending"] == 0)
+    assert hasher.metrics()["completed"] == 1
+    assert hasher.metrics()["rejected"] == 1
+
+
+async def test_failures_are_not_counted_as_completed(hasher):
+    def broken():
+        raise ValueError("invalid salt")
+
+    with pytest.raises(ValueError):
+        await hasher._run(broken)
+    assert await hasher._run(lambda: "hash") == "hash"
+    await _until(lambda: hasher.metrics()["pending"] == 0)
+    metrics = hasher.metrics()
+    assert (metrics["completed"], metrics["failed"]) == (1, 1)
@@ -0,0 +1,123 @@
+import os
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import InvalidTokenError
+
+from app.auth import utils
+from app.auth.keys import JWTKeyManager
+
+
+def _write_key_pair(directory, name: str) -> tuple:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path, public_path = directory / f"{name}-private.pem", directory / f"{name}-public.pem"
+    private_path.write_bytes(
+        key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    public_path.write_bytes(
+        key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    )
+    return private_path, public_path
+
+
+@pytest.fixture(scope="module")
+def key_pairs(tmp_path_factory) -> dict:
+    directory = tmp_path_factory.mktemp("jwt-keys")
+    return {name: _write_key_pair(directory, name) for name in ("first", "second", "third")}
+
+
+@pytest.fixture
+def manager(key_pairs, monkeypatch) -> JWTKeyManager:
+    """Manager signing with `first` as kid "k1", also accepting `second` as "k0"; used by encode/decode_jwt."""
+    manager = JWTKeyManager(
+        private_key_path=key_pairs["first"][0],
+        public_key_path=key_pairs["first"][1],
+        key_id="k1",
+        extra_public_key_paths={"k0": key_pairs["second"][1]},
+        reload_interval=0,
+    )
+    monkeypatch.setattr(utils, "key_manager", manager)
+    return manager
+
+
+def _public_numbers(key) -> int:
+    return key.public_key().public_numbers().n if hasattr(key, "public_key") else key.public_numbers().n
+
+
+def test_tokens_carry_the_kid_and_verify_with_its_key(manager, key_pairs):
+    token = utils.encode_jwt({"sub": 1})
+    assert jwt.get_unverified_header(token)["kid"] == "k1"
+    assert utils.decode_jwt(token)["sub"] == "1"
+
+    # a token of the other active key is verified with that key
+    second_private = serialization.load_pem_private_key(key_pairs["second"][0].read_bytes(), password=None)
+    token = jwt.encode({"sub": "2"}, second_private, algorithm="RS256", headers={"kid": "k0"})
+    assert utils.decode_jwt(token)["sub"] == "2"
+
+
+def test_unknown_kid_is_rejected(manager, key_pairs):
+    third_private = serialization.load_pem_private_key(key_pairs["third"][0].read_bytes(), password=None)
+    token = jwt.encode({"sub": "3"}, third_private, algorithm="RS256", headers={"kid": "k9"})
+    with pytest.raises(InvalidTokenError, match="Unknown key id: k9"):
+        utils.decode_jwt(token)
+
+
+def test_changed_file_is_reloaded_by_mtime(key_pairs, tmp_path):
+    path = tmp_path / "private.pem"
+    path.write_bytes(key_pairs["first"][0].read_bytes())
+    manager = JWTKeyManager(private_key_path=path, public_key_path=key_pairs["first"][1], reload_interval=0)
+    first = manager.signing_key()
+    assert manager.signing_key() is first  # same mtime: not parsed again
+
+    path.write_bytes(key_pairs["second"][0].read_bytes())
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _public_numbers(manager.signing_key()) != _public_numbers(first)
+
+
+def test_reload_waits_for_the_interval(key_pairs, tmp_path):
+    path = tmp_path / "private.pem"
+    path.write_bytes(key_pairs["first"][0].read_bytes())
+    manager = JWTKeyManager(private_key_path=path, public_key_path=key_pairs["first"][1], reload_interval=3600)
+    first = manager.signing_key()
+    path.write_bytes(key_pairs["second"][0].read_bytes())
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert manager.signing_key() is first
+
+
+def test_rotation_signs_with_the_new_kid_and_keeps_the_old_one(manager, key_pairs):
+    old_token = utils.encode_jwt({"sub": 1})
+
+    manager.rotate(private_key_path=key_pairs["third"][0], key_id="k2", public_key_path=key_pairs["third"][1])
+    new_token = utils.encode_jwt({"sub": 2})
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+    assert utils.decode_jwt(new_token)["sub"] == "2"
+    assert utils.decode_jwt(old_token)["sub"] == "1"
+
+    manager.remove_public_key("k1")
+    with pytest.raises(InvalidTokenError, match="Unknown key id: k1"):
+        utils.decode_jwt(old_token)
+
+
+def test_rotation_to_a_kid_without_public_key_fails(manager, key_pairs):
+    with pytest.raises(ValueError, match="k5"):
+        manager.rotate(private_key_path=key_pairs["third"][0], key_id="k5")
+    assert manager.key_id == "k1"
+
+    # a kid registered beforehand needs no public_key_path
+    manager.add_public_key("k3", key_pairs["third"][1])
+    manager.rotate(private_key_path=key_pairs["third"][0], key_id="k3")
+    assert utils.decode_jwt(utils.encode_jwt({"sub": 3}))["sub"] == "3"
+
+
+def test_tokens_without_kid_still_verify_after_a_kid_is_introduced(key_pairs, monkeypatch):
+    manager = JWTKeyManager(private_key_path=key_pairs["first"][0], public_key_path=key_pairs["first"][1])
+    monkeypatch.setattr(utils, "key_manager", manager)
+    old_token = utils.encode_jwt({"sub": 1})
+    assert "kid" not in jwt.get_unverified_header(old_token)
+
+    manager.rotate(private_key_path=key_pairs["second"][0], key_id="k2", public_key_path=key_pairs["second"][1])
+    assert utils.decode_jwt(old_token)["sub"] == "1"
+    assert utils.decode_jwt(utils.encode_jwt({"sub": 2}))["sub"] == "2"
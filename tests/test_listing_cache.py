@@ -0,0 +1,67 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.api.api_v1.crud.tasks import bump_project_version
+from app.models import Project, Task
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_task_listing_is_not_served_stale_after_foreign_write(client, auth, project_id, session):
+    response = await client.get(f"/projects/{project_id}/tasks", headers=auth)
+    assert response.json()["items"] == []
+    etag = response.headers["ETag"]
+
+    # a write committed by another worker: this worker's cache is never invalidated
+    owner_id = (await session.get(Project, project_id)).user_id
+    await session.execute(insert(Task).values(title="elsewhere", project_id=project_id, user_id=owner_id))
+    await bump_project_version(session, project_id, "create", Counter(total=1, normal=1))
+    await session.commit()
+
+    response = await client.get(f"/projects/{project_id}/tasks", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()["items"]] == ["elsewhere"]
+    assert response.headers["ETag"] != etag
+
+
+async def test_project_listing_is_not_served_stale_after_foreign_write(client, auth, project_id, session):
+    response = await client.get("/projects", headers=auth)
+    assert [project["id"] for project in response.json()] == [project_id]
+    owner_id = (await session.get(Project, project_id)).user_id
+
+    await session.execute(insert(Project).values(name="elsewhere", description="test", user_id=owner_id))
+    await session.commit()
+
+    response = await client.get("/projects", headers=auth)
+    assert [project["name"] for project in response.json()] == ["Test project", "elsewhere"]
+
+
+async def test_project_etag_changes_on_late_committed_write(client, auth, project_id, session):
+    await client.post("/projects", json={"name": "Newer", "description": "test"}, headers=auth)
+    etag = (await client.get("/projects", headers=auth)).headers["ETag"]
+
+    # a task write whose transaction started before the newest project was touched:
+    # its now() is older than max(updated_at), but the version still moves
+    await session.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(version=Project.version + 1, updated_at=datetime(2000, 1, 1, tzinfo=timezone.utc))
+    )
+    await session.commit()
+
+    response = await client.get("/projects", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+async def test_project_etag_changes_on_delete_then_create(client, auth, project_id):
+    etag = (await client.get("/projects", headers=auth)).headers["ETag"]
+    await client.delete(f"/projects/{project_id}", headers=auth)
+    await client.post("/projects", json={"name": "Replacement", "description": "test"}, headers=auth)
+
+    response = await client.get("/projects", headers={**auth, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert [project["name"] for project in response.json()] == ["Replacement"]
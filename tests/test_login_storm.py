@@ -0,0 +1,57 @@
+"""A burst of logins must not slow down requests that don't hash passwords."""
+import asyncio
+import math
+import time
+
+import pytest
+
+from app.auth.hashing import password_hasher
+
+pytestmark = pytest.mark.postgres
+
+STORM_LOGINS = 48
+SAMPLES = 40
+
+
+def p99(latencies: list[float]) -> float:
+    """Nearest rank, as in benchmarks.load_test: with few samples this is the slowest one."""
+    ordered = sorted(latencies)
+    return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+
+
+async def _sample(client, headers) -> list[float]:
+    latencies = []
+    for _ in range(SAMPLES):
+        started_at = time.perf_counter()
+        response = await client.get("/projects", headers=headers)
+        latencies.append(time.perf_counter() - started_at)
+        assert response.status_code == 200, response.text
+    return latencies
+
+
+async def test_reads_stay_fast_during_a_login_storm(client, register, password, auth, project_id):
+    await register(client, email="storm@example.com", name="Storm")
+    baseline = p99(await _sample(client, auth))
+
+    async def login():
+        return await client.post("/auth/login", json={"email": "storm@example.com", "password": password})
+
+    def reached_hasher() -> int:
+        metrics = password_hasher.metrics()
+        return sum(metrics[key] for key in ("pending", "completed", "failed", "rejected"))
+
+    before = reached_hasher()
+    storm = [asyncio.create_task(login()) for _ in range(STORM_LOGINS)]
+    # sample once every login has been parsed and looked up (the client shares the event
+    # loop in-process): from then on the storm is only bcrypt
+    while reached_hasher() - before < STORM_LOGINS:
+        await asyncio.sleep(0.005)
+    during = p99(await _sample(client, auth))
+    still_hashing = not all(task.done() for task in storm)
+    statuses = [response.status_code for response in await asyncio.gather(*storm)]
+
+    # the storm really overlapped the samples; logins either succeed or are shed
+    assert still_hashing
+    assert set(statuses) <= {200, 503}
+    # bcrypt runs in its own threads and the login holds no pooled connection meanwhile
+    assert during < max(baseline * 5, baseline + 0.1), f"p99 {baseline * 1000:.1f} ms -> {during * 1000:.1f} ms"
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.metrics import _QUERY_STARTS, MetricsRegistry, RequestTimings
+
+
+def _lines(registry: MetricsRegistry, prefix: str) -> list[str]:
+    return [line for line in registry.render().splitlines() if prefix in line]
+
+
+def test_collector_counters_get_the_total_suffix():
+    registry = MetricsRegistry()
+    registry.add_collector(
+        "pool", lambda: {"size": 5, "checkouts": 12, "wait_seconds_total": 0.5, "label": "x"}, counters=("checkouts", "wait_seconds_total")
+    )
+    assert _lines(registry, "app_pool_") == [
+        "# TYPE app_pool_size gauge",
+        "app_pool_size 5",
+        "# TYPE app_pool_checkouts_total counter",
+        "app_pool_checkouts_total 12",
+        "# TYPE app_pool_wait_seconds_total counter",
+        "app_pool_wait_seconds_total 0.5",
+    ]
+
+
+def test_route_metrics_are_counters_and_a_histogram():
+    registry = MetricsRegistry()
+    timings = RequestTimings()
+    timings.queries = 2
+    registry.observe("GET", "/api/v1/projects", 0.03, timings, 200)
+    registry.observe("GET", "/api/v1/projects", 0.2, timings, 503)
+    text_ = registry.render()
+    assert "# TYPE app_http_requests_total counter" in text_
+    assert 'app_http_requests_total{method="GET",route="/api/v1/projects"} 2' in text_
+    assert 'app_http_server_errors_total{method="GET",route="/api/v1/projects"} 1' in text_
+    assert 'app_db_queries_total{method="GET",route="/api/v1/projects"} 4' in text_
+    assert 'app_http_request_duration_seconds_bucket{method="GET",route="/api/v1/projects",le="0.05"} 1' in text_
+    assert 'app_http_request_duration_seconds_bucket{method="GET",route="/api/v1/projects",le="+Inf"} 2' in text_
+
+
+async def _metrics(client, **headers):
+    return await client.get(f"http://test{settings.metrics.path}", headers=headers)
+
+
+async def test_metrics_endpoint_needs_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings.metrics, "token", None)
+    assert (await _metrics(client)).status_code == 404
+
+    monkeypatch.setattr(settings.metrics, "token", "scrape-secret")
+    assert (await _metrics(client)).status_code == 401
+    assert (await _metrics(client, Authorization="Bearer wrong")).status_code == 401
+
+    response = await _metrics(client, Authorization="Bearer scrape-secret")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE app_rate_limit_allowed_total counter" in response.text
+
+
+@pytest.mark.postgres
+async def test_failed_statement_drops_its_start_time(clean_database):
+    async with clean_database.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(DBAPIError):
+                await connection.execute(text("SELECT * FROM no_such_table"))
+            await connection.rollback()
+        await connection.execute(text("SELECT 1"))
+        info = (await connection.get_raw_connection()).info
+        assert info.get(_QUERY_STARTS, []) == []
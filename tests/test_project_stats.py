@@ -0,0 +1,87 @@
+"""project_task_stats is kept up to date with increments by every task write path."""
+import json
+
+import pytest
+from sqlalchemy import select, text
+
+from app.api.api_v1.crud.stats import rebuild_project_stats
+from app.api.api_v1.crud.tasks import STATS_COUNTERS, stats_columns
+from app.core.config import settings
+from app.models import ProjectTaskStats, Task
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture(autouse=True)
+def counters_table(monkeypatch):
+    monkeypatch.setattr(settings.stats, "counters_table", True)
+
+
+async def _counters(session, project_id: int) -> dict:
+    columns = [getattr(ProjectTaskStats, name) for name in STATS_COUNTERS]
+    row = (await session.execute(select(*columns).where(ProjectTaskStats.project_id == project_id))).one()
+    return dict(zip(STATS_COUNTERS, row))
+
+
+async def _recount(session, project_id: int) -> dict:
+    row = (await session.execute(select(*stats_columns()).where(Task.project_id == project_id))).one()
+    return dict(zip(STATS_COUNTERS, row))
+
+
+async def test_single_writes_apply_deltas(client, auth, session, project_id, queries):
+    api = f"/projects/{project_id}/tasks"
+    ids = []
+    for title, status, priority in [
+        ("a", "pending", "urgent"),
+        ("b", "completed", "urgent"),
+        ("c", "pending", "low"),
+    ]:
+        response = await client.post(api, json={"title": title, "status": status, "priority": priority}, headers=auth)
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    assert await _counters(session, project_id) == await _recount(session, project_id)
+
+    response = await client.patch(f"{api}/{ids[0]}", json={"status": "completed", "priority": "high"}, headers=auth)
+    assert response.status_code == 200, response.text
+    response = await client.patch(f"{api}/{ids[1]}", json={"title": "renamed"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert await _counters(session, project_id) == await _recount(session, project_id)
+
+    queries.clear()
+    response = await client.delete(f"{api}/{ids[1]}", headers=auth)
+    assert response.status_code == 200, response.text
+    # the delete and the counter change are one statement, and nothing recounts the project
+    assert len(queries) == 1 and "project_task_stats" in queries[0]
+    assert "count(tasks.id)" not in queries[0]
+    assert await _counters(session, project_id) == {"total": 2, "done": 1, "urgent": 0, "high": 1, "normal": 0, "low": 1}
+
+
+async def test_batch_and_import_apply_deltas(client, auth, session, project_id):
+    api = f"/projects/{project_id}/tasks"
+    first = (await client.post(api, json={"title": "first", "priority": "low"}, headers=auth)).json()["id"]
+    second = (await client.post(api, json={"title": "second", "status": "completed"}, headers=auth)).json()["id"]
+
+    batch = {
+        "create": [{"title": "x", "priority": "urgent"}, {"title": "y", "status": "completed"}],
+        "update": [{"id": first, "status": "completed", "priority": "high"}, {"id": 10**9, "status": "completed"}],
+        "delete": [second],
+    }
+    response = await client.post(f"{api}:batch", json=batch, headers=auth)
+    assert response.status_code == 200, response.text
+    assert await _counters(session, project_id) == await _recount(session, project_id)
+
+    rows = [{"title": f"imported {i}", "priority": "urgent", "status": "completed" if i % 2 else "pending"} for i in range(5)]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = await client.post(f"{api}:import", content=body, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 5
+    assert await _counters(session, project_id) == await _recount(session, project_id)
+
+
+async def test_rebuild_repairs_drifted_counters(client, auth, session, project_id):
+    await client.post(f"/projects/{project_id}/tasks", json={"title": "task", "status": "completed"}, headers=auth)
+    await session.execute(text("UPDATE project_task_stats SET total = 42, done = 0"))
+    await session.commit()
+
+    assert await rebuild_project_stats(session) == 1
+    assert await _counters(session, project_id) == await _recount(session, project_id)
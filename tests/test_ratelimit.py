@@ -0,0 +1,130 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.api_v1 import rate_limit
+from app.api.api_v1.crud import auth
+from app.core import ratelimit
+from app.core.config import RateLimit, settings
+from app.core.ratelimit import MemoryRateLimitBackend, RateLimiter
+from app.main import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+async def test_burst_then_retry_after(clock):
+    backend = MemoryRateLimitBackend()
+    for _ in range(3):
+        assert await backend.take("key", rate=0.5, burst=3) == 0
+    # empty bucket: one token takes 1 / rate seconds
+    assert await backend.take("key", rate=0.5, burst=3) == pytest.approx(2.0)
+
+    clock.now += 1.5
+    assert await backend.take("key", rate=0.5, burst=3) == pytest.approx(0.5)
+
+
+async def test_refill_is_capped_at_burst(clock):
+    backend = MemoryRateLimitBackend()
+    for _ in range(2):
+        await backend.take("key", rate=1, burst=2)
+    clock.now += 2
+    assert await backend.take("key", rate=1, burst=2) == 0
+
+    clock.now += 3600
+    results = [await backend.take("key", rate=1, burst=2) for _ in range(3)]
+    assert results[:2] == [0, 0]
+    assert results[2] == pytest.approx(1.0)
+
+
+async def test_idle_keys_are_evicted(clock):
+    backend = MemoryRateLimitBackend(idle_seconds=60)
+    await backend.take("old", rate=1, burst=1)
+    clock.now += 30
+    await backend.take("recent", rate=1, burst=1)
+    clock.now += 31
+    await backend.take("new", rate=1, burst=1)
+    assert set(backend._buckets) == {"recent", "new"}
+
+    # a used key moves to the back and outlives keys idle for longer
+    clock.now += 20
+    await backend.take("recent", rate=1, burst=1)
+    clock.now += 45
+    await backend.take("newest", rate=1, burst=1)
+    assert set(backend._buckets) == {"recent", "newest"}
+
+
+async def test_max_keys_evicts_least_recently_used(clock):
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b"):
+        await backend.take(key, rate=1, burst=1)
+        clock.now += 1
+    await backend.take("a", rate=1, burst=1)
+    await backend.take("c", rate=1, burst=1)
+    assert list(backend._buckets) == ["a", "c"]
+    assert len(backend) == 2
+
+
+async def test_limiter_uses_route_buckets_and_counts(clock):
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(),
+        default=RateLimit(rate=1, burst=1),
+        routes={"POST /api/v1/auth/login": RateLimit(rate=0.1, burst=1)},
+    )
+    assert await limiter.check("POST /api/v1/auth/login", "ip:1") == 0
+    assert await limiter.check("POST /api/v1/auth/login", "ip:1") == pytest.approx(10.0)
+    # other routes share the default bucket, separate from login's
+    assert await limiter.check("GET /api/v1/projects", "ip:1") == 0
+    assert await limiter.check("GET /api/v1/projects/{project_id}/tasks", "ip:1") == pytest.approx(1.0)
+    assert limiter.metrics() == {"allowed": 2, "rejected": 2, "backend_errors": 0, "keys": 2}
+
+
+async def test_disabled_limiter_does_not_decode_the_token(monkeypatch):
+    decoded = []
+    monkeypatch.setattr(auth, "decode_jwt", lambda token: decoded.append(token) or {"sub": "1"})
+    monkeypatch.setattr(rate_limit.rate_limiter, "enabled", False)
+    request = Request({"type": "http", "headers": [(b"authorization", b"Bearer token")]})
+
+    await rate_limit.enforce_rate_limit(request)
+    assert decoded == []
+
+
+def test_configured_routes_exist():
+    keys = {f"{method} {route.path}" for route in app.routes for method in getattr(route, "methods", ())}
+    assert set(settings.rate_limit.routes) <= keys
+
+
+async def test_buckets_are_keyed_on_method_and_path(clock, monkeypatch):
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(),
+        default=RateLimit(rate=1, burst=100),
+        routes={"POST /api/v1/projects/{project_id}/tasks:import": RateLimit(rate=0.1, burst=1)},
+    )
+    monkeypatch.setattr(rate_limit, "rate_limiter", limiter)
+
+    def request(method: str, path: str, name: str) -> Request:
+        route = type("Route", (), {"path": path, "name": name})()
+        return Request({"type": "http", "method": method, "headers": [], "client": ("10.0.0.1", 1), "route": route})
+
+    tasks_import = request("POST", "/api/v1/projects/{project_id}/tasks:import", "import_tasks_endpoint")
+    # an endpoint with the same function name elsewhere doesn't share the import bucket
+    other_import = request("POST", "/api/v1/admin/import", "import_tasks_endpoint")
+    await rate_limit.enforce_rate_limit(tasks_import)
+    await rate_limit.enforce_rate_limit(other_import)
+    await rate_limit.enforce_rate_limit(other_import)
+    with pytest.raises(HTTPException) as exc_info:
+        await rate_limit.enforce_rate_limit(tasks_import)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "10"
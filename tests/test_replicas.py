@@ -0,0 +1,73 @@
+"""Read routes go to a replica, except right after the same client wrote."""
+import itertools
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models import db_helper
+from app.models.db_helper import LAST_WRITE_COOKIE, LAST_WRITE_HEADER
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+async def replica(clean_database, monkeypatch) -> list[str]:
+    """A replica engine (the same test database) added to the app's helper; returns the statements it ran."""
+    helper = clean_database
+    helper.start()
+    engine = create_async_engine(url=helper.url, **helper.engine_kwargs)
+    monkeypatch.setattr(helper, "_replica_engines", [engine])
+    monkeypatch.setattr(helper, "_replica_factories", itertools.cycle([helper._make_session_factory(engine)]))
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    yield statements
+    await engine.dispose()
+
+
+async def test_read_goes_to_the_replica(client, auth, replica, queries):
+    client.cookies.clear()
+    replica.clear()
+    queries.clear()
+    response = await client.get("/projects/stats", headers=auth)
+    assert response.status_code == 200, response.text
+    assert any("projects" in statement for statement in replica), replica
+    # the primary only serves the authentication lookup, if any
+    assert not any("projects" in statement for statement in queries), queries
+
+
+async def test_read_after_write_stays_on_the_primary(client, auth, replica, queries, monkeypatch):
+    response = await client.post("/projects", json={"name": "New", "description": "write"}, headers=auth)
+    assert response.status_code == 200, response.text
+    stamp = response.headers[LAST_WRITE_HEADER]
+    assert response.cookies[LAST_WRITE_COOKIE] == stamp
+
+    # the cookie the client got back keeps its reads on the primary
+    replica.clear()
+    queries.clear()
+    response = await client.get("/projects/stats", headers=auth)
+    assert response.status_code == 200, response.text
+    assert replica == []
+    assert any("projects" in statement for statement in queries), queries
+
+    # so does the header, for clients that don't keep cookies
+    client.cookies.clear()
+    replica.clear()
+    response = await client.get("/projects/stats", headers={**auth, LAST_WRITE_HEADER: stamp})
+    assert response.status_code == 200, response.text
+    assert replica == []
+
+    # once the window has passed, reads go back to the replica
+    monkeypatch.setattr(db_helper, "read_your_writes_seconds", 0.0)
+    response = await client.get("/projects/stats", headers={**auth, LAST_WRITE_HEADER: stamp})
+    assert response.status_code == 200, response.text
+    assert replica
+
+
+async def test_no_write_marker_without_replicas(client, auth):
+    response = await client.post("/projects", json={"name": "New", "description": "write"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert LAST_WRITE_HEADER not in response.headers
+    assert LAST_WRITE_COOKIE not in response.cookies
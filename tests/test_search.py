@@ -0,0 +1,74 @@
+import pytest
+
+from app.api.api_v1.crud.search import search_projects, search_tasks
+
+pytestmark = pytest.mark.postgres
+
+
+async def _task(client, auth, project_id: int, title: str, description: str = "") -> int:
+    response = await client.post(
+        f"/projects/{project_id}/tasks", json={"title": title, "description": description}, headers=auth
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def _search(client, auth, **params) -> dict:
+    response = await client.get("/search", params=params, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_tasks_are_ranked_by_relevance(session, client, auth, project_id):
+    once = await _task(client, auth, project_id, "invoice", "send it")
+    twice = await _task(client, auth, project_id, "invoice for march", "the march invoice is late")
+    await _task(client, auth, project_id, "unrelated")
+    user_id = (await client.get("/auth/users/me", headers=auth)).json()["id"]
+
+    rows = await search_tasks(session, user_id, "invoice", limit=10)
+    assert [row.id for row in rows] == [twice, once]
+    assert rows[0].rank > rows[1].rank
+
+    # websearch syntax: a phrase, an excluded word
+    assert [row.id for row in await search_tasks(session, user_id, '"march invoice"', limit=10)] == [twice]
+    assert [row.id for row in await search_tasks(session, user_id, "invoice -march", limit=10)] == [once]
+    # limit/offset page through the ranking
+    assert [row.id for row in await search_tasks(session, user_id, "invoice", limit=1, offset=1)] == [once]
+
+
+async def test_endpoint_returns_tasks_and_projects(client, auth, project_id):
+    task_id = await _task(client, auth, project_id, "Test task")
+    body = await _search(client, auth, q="test")
+    assert [hit["id"] for hit in body["tasks"]] == [task_id]
+    assert body["tasks"][0]["project_id"] == project_id
+    assert [hit["id"] for hit in body["projects"]] == [project_id]
+
+    assert (await _search(client, auth, q="test", type="projects"))["tasks"] == []
+    assert (await _search(client, auth, q="test", type="tasks"))["projects"] == []
+
+
+async def test_empty_queries(client, auth, project_id):
+    await _task(client, auth, project_id, "Test task")
+    assert (await client.get("/search", params={"q": ""}, headers=auth)).status_code == 422
+    # queries without any word match nothing instead of failing
+    for q in ("   ", "!!!", "-", '""'):
+        assert await _search(client, auth, q=q) == {"tasks": [], "projects": []}
+
+
+async def test_search_is_scoped_to_the_owner(session, client, register, auth, project_id):
+    await _task(client, auth, project_id, "secret plan")
+    stranger = await register(client, email="stranger@example.com", name="Stranger")
+    response = await client.post("/projects", json={"name": "Secret project", "description": "mine"}, headers=stranger)
+    own_project = response.json()["id"]
+
+    body = await _search(client, stranger, q="secret")
+    assert body["tasks"] == []
+    assert [hit["id"] for hit in body["projects"]] == [own_project]
+
+    stranger_id = (await client.get("/auth/users/me", headers=stranger)).json()["id"]
+    assert await search_tasks(session, stranger_id, "plan", limit=10) == []
+    assert [row.id for row in await search_projects(session, stranger_id, "secret", limit=10)] == [own_project]
+
+
+async def test_search_needs_auth(client):
+    assert (await client.get("/search", params={"q": "test"})).status_code == 401
@@ -0,0 +1,118 @@
+"""Supervisor: spawning, reaping, respawning and shutting down forked workers.
+
+The workers here are tiny forked functions instead of uvicorn servers, so the
+tests exercise only the parent's bookkeeping.
+"""
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from app.core.config import RunConfig
+from app.server import Supervisor
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the supervisor needs fork()")
+
+
+class FakeSupervisor(Supervisor):
+    """Runs `behaviours[n]` (the last one for later workers) as the n-th forked worker."""
+
+    poll_interval = 0.01
+    respawn_delay = 0.05
+    max_respawn_delay = 0.2
+    kill_grace = 0.1
+
+    def __init__(self, behaviours, count: int = 1, **config):
+        super().__init__(None, RunConfig(host="127.0.0.1", port=0, graceful_timeout=0.1, **config), count)
+        self.behaviours = behaviours
+        self.spawned_at: list[float] = []
+
+    def _spawn(self) -> None:
+        self.spawned_at.append(time.monotonic())
+        super()._spawn()
+
+    def _worker_main(self) -> int:
+        behaviour = self.behaviours[min(len(self.spawned_at), len(self.behaviours)) - 1]
+        return behaviour()
+
+
+def crash() -> int:
+    return 1
+
+
+def serve() -> int:
+    while True:
+        signal.pause()
+
+
+def ignore_sigterm() -> int:
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    while True:
+        signal.pause()
+
+
+def _stop_after(seconds: float) -> threading.Timer:
+    timer = threading.Timer(seconds, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+    return timer
+
+
+def test_workers_crashing_at_startup_make_the_server_exit_non_zero():
+    supervisor = FakeSupervisor([crash], count=2, max_worker_crashes=4, crash_window_seconds=60)
+    started_at = time.monotonic()
+    assert supervisor.run() == 1
+    assert time.monotonic() - started_at < 5
+    assert supervisor.workers == set()
+    # 2 workers, then restarts until the 4th crash inside the window
+    assert 4 <= len(supervisor.spawned_at) <= 5
+
+
+def test_respawn_delay_doubles_up_to_the_cap():
+    supervisor = FakeSupervisor([crash], max_worker_crashes=6, crash_window_seconds=60)
+    assert supervisor.run() == 1
+    gaps = [later - earlier for earlier, later in zip(supervisor.spawned_at, supervisor.spawned_at[1:])]
+    assert len(gaps) == 5
+    # 0.05, 0.1, 0.2, then capped at 0.2 (plus polling and fork time)
+    for gap, delay in zip(gaps, (0.05, 0.1, 0.2, 0.2, 0.2)):
+        assert delay <= gap < delay + 0.15, gaps
+
+
+def test_crashes_outside_the_window_do_not_add_up():
+    supervisor = FakeSupervisor([crash], max_worker_crashes=2, crash_window_seconds=0.01)
+    supervisor.max_respawn_delay = supervisor.respawn_delay
+    timer = _stop_after(0.5)
+    try:
+        assert supervisor.run() == 0
+    finally:
+        timer.cancel()
+    assert len(supervisor.spawned_at) > 2
+
+
+def test_crashed_worker_is_replaced_and_shutdown_is_graceful():
+    supervisor = FakeSupervisor([crash, serve], count=2)
+    timer = _stop_after(0.5)
+    try:
+        assert supervisor.run() == 0
+    finally:
+        timer.cancel()
+    # the first worker crashed and was replaced once; the healthy ones drained on SIGTERM
+    assert len(supervisor.spawned_at) == 3
+    assert supervisor.workers == set()
+    assert signal.getsignal(signal.SIGTERM) is not supervisor._stop
+
+
+def test_workers_ignoring_sigterm_are_killed_after_the_grace_period():
+    supervisor = FakeSupervisor([ignore_sigterm], count=2)
+    timer = _stop_after(0.2)
+    started_at = time.monotonic()
+    try:
+        assert supervisor.run() == 0
+    finally:
+        timer.cancel()
+    elapsed = time.monotonic() - started_at
+    # graceful_timeout + kill_grace after the signal, not forever
+    assert 0.2 + 0.2 <= elapsed < 2, elapsed
+    assert supervisor.workers == set()
+    assert len(supervisor.spawned_at) == 2
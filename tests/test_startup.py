@@ -0,0 +1,71 @@
+"""Cold start stays cheap: deferred imports, bounded import time and time to the first request.
+
+`benchmarks/cold_start.py` reports the same phases as medians over several runs.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.cold_start import PROBE
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# generous for slow CI machines: a regression that loads e.g. the driver eagerly
+# shows up in the module checks, the budgets catch larger slowdowns
+IMPORT_BUDGET_SECONDS = float(os.environ.get("TEST_IMPORT_BUDGET_SECONDS", "3.0"))
+FIRST_REQUEST_BUDGET_SECONDS = float(os.environ.get("TEST_FIRST_REQUEST_BUDGET_SECONDS", "5.0"))
+DEFERRED_MODULES = ("asyncpg", "redis")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started_at = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started_at
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {modules!r} if name in sys.modules]}}))
+"""
+
+
+def _run(script: str, **env: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env={**os.environ, **env}, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def _import(module: str, modules: tuple[str, ...]) -> dict:
+    return _run(_IMPORT_SCRIPT.format(module=module, modules=modules))
+
+
+def test_import_defers_driver():
+    # the first run fills __pycache__, which the budget shouldn't pay for
+    _import("app.main", DEFERRED_MODULES)
+    report = _import("app.main", DEFERRED_MODULES)
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS, report
+
+
+def test_user_schemas_defer_email_validator():
+    # only the schemas: FastAPI 0.104 imports email-validator itself in fastapi.openapi.models
+    report = _import("app.schemas.user", ("email_validator",))
+    assert report["loaded"] == []
+
+
+@pytest.mark.postgres
+def test_first_request_within_budget(database):
+    # warm a couple of connections, so the startup phase includes connecting to Postgres
+    _run(PROBE, APP_CONFIG__DB__POOL_WARMUP="2")
+    report = _run(PROBE, APP_CONFIG__DB__POOL_WARMUP="2")
+    assert report["import"] < IMPORT_BUDGET_SECONDS, report
+    assert report["total"] < FIRST_REQUEST_BUDGET_SECONDS, report
+
+
+def test_user_schema_still_validates_emails():
+    from app.schemas.user import UserCreate
+
+    user = UserCreate(email="someone@EXAMPLE.com", name="Someone", password="secret")
+    assert user.email == "someone@example.com"
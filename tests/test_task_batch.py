@@ -0,0 +1,84 @@
+import pytest
+
+pytestmark = pytest.mark.postgres
+
+
+async def _create(client, auth, project_id: int, title: str) -> int:
+    response = await client.post(f"/projects/{project_id}/tasks", json={"title": title}, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def _titles(client, auth, project_id: int) -> dict[int, str]:
+    response = await client.get(f"/projects/{project_id}/tasks", params={"paginate": "false"}, headers=auth)
+    return {task["id"]: task["title"] for task in response.json()}
+
+
+@pytest.fixture
+async def other_project_id(client, auth) -> int:
+    response = await client.post("/projects", json={"name": "Other", "description": "other"}, headers=auth)
+    return response.json()["id"]
+
+
+async def test_mixed_batch_reports_every_operation(client, auth, project_id, other_project_id):
+    keep, drop = await _create(client, auth, project_id, "keep"), await _create(client, auth, project_id, "drop")
+    foreign = await _create(client, auth, other_project_id, "foreign")
+    missing = 10**9
+
+    batch = {
+        "create": [{"title": "new 1"}, {"title": "new 2", "priority": "urgent"}],
+        "update": [
+            {"id": keep, "title": "kept"},
+            {"id": missing, "title": "nope"},
+            {"id": keep, "title": "twice"},
+            {"id": foreign, "title": "not here"},
+        ],
+        "delete": [drop, missing, drop, foreign],
+    }
+    response = await client.post(f"/projects/{project_id}/tasks:batch", json=batch, headers=auth)
+    assert response.status_code == 200, response.text
+    results = [(r["op"], r["index"], r["status"], r["id"]) for r in response.json()["results"]]
+    created = [r["id"] for r in response.json()["results"] if r["op"] == "create"]
+    assert results == [
+        ("create", 0, 201, created[0]),
+        ("create", 1, 201, created[1]),
+        ("update", 0, 200, keep),
+        ("update", 1, 404, missing),
+        ("update", 2, 409, keep),
+        ("update", 3, 404, foreign),
+        ("delete", 0, 200, drop),
+        ("delete", 1, 404, missing),
+        ("delete", 2, 409, drop),
+        ("delete", 3, 404, foreign),
+    ]
+
+    assert await _titles(client, auth, project_id) == {keep: "kept", created[0]: "new 1", created[1]: "new 2"}
+    # ids of another project are neither updated nor deleted
+    assert await _titles(client, auth, other_project_id) == {foreign: "foreign"}
+
+
+async def test_batch_of_misses_changes_nothing(client, auth, project_id, queries):
+    queries.clear()
+    response = await client.post(
+        f"/projects/{project_id}/tasks:batch", json={"update": [{"id": 10**9, "title": "x"}], "delete": [10**9]}, headers=auth
+    )
+    assert [r["status"] for r in response.json()["results"]] == [404, 404]
+    # nothing changed, so the project version (and with it the cached listings) stays
+    assert not any("UPDATE projects" in statement for statement in queries), queries
+
+
+async def test_mixed_batch_query_count(client, auth, project_id, queries):
+    task_id = await _create(client, auth, project_id, "task")
+    other_id = await _create(client, auth, project_id, "other")
+    batch = {"create": [{"title": "a"}, {"title": "b"}], "update": [{"id": task_id, "status": "completed"}], "delete": [other_id]}
+    queries.clear()
+    response = await client.post(f"/projects/{project_id}/tasks:batch", json=batch, headers=auth)
+    assert response.status_code == 200, response.text
+    # project check, one insert, one update per set of changed fields, one delete, one version bump
+    assert len(queries) == 5, queries
+
+
+async def test_batch_on_a_foreign_project_is_404(client, auth, register, project_id):
+    stranger = await register(client, email="stranger@example.com", name="Stranger")
+    response = await client.post(f"/projects/{project_id}/tasks:batch", json={"delete": [1]}, headers=stranger)
+    assert response.status_code == 404
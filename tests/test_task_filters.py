@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.api_v1.crud.tasks import _filter_conditions, _owned_tasks_stmt
+from app.models import Task
+from app.schemas.task import TaskFilters
+
+pytestmark = pytest.mark.postgres
+
+
+@pytest.fixture
+async def deadlines(client, auth, project_id) -> dict[str, int]:
+    """One task per deadline/status combination the filters distinguish."""
+    now = datetime.now(timezone.utc)
+    tasks = {
+        "overdue": {"deadline": now - timedelta(days=1)},
+        "past_completed": {"deadline": now - timedelta(days=1), "status": "completed"},
+        "upcoming": {"deadline": now + timedelta(days=1)},
+        "no_deadline": {},
+        "no_deadline_completed": {"status": "completed"},
+    }
+    ids = {}
+    for title, fields in tasks.items():
+        if "deadline" in fields:
+            fields["deadline"] = fields["deadline"].isoformat()
+        response = await client.post(f"/projects/{project_id}/tasks", json={"title": title, **fields}, headers=auth)
+        assert response.status_code == 200, response.text
+        ids[title] = response.json()["id"]
+    return ids
+
+
+async def _titles(client, auth, project_id, **params) -> set[str]:
+    response = await client.get(f"/projects/{project_id}/tasks", params=params, headers=auth)
+    assert response.status_code == 200, response.text
+    return {task["title"] for task in response.json()["items"]}
+
+
+async def test_overdue_filters_partition_the_tasks(client, auth, project_id, deadlines):
+    overdue = await _titles(client, auth, project_id, overdue="true")
+    not_overdue = await _titles(client, auth, project_id, overdue="false")
+    assert overdue == {"overdue"}
+    # tasks without a deadline are never overdue, so overdue=false must keep them
+    assert not_overdue == {"past_completed", "upcoming", "no_deadline", "no_deadline_completed"}
+    assert overdue | not_overdue == set(deadlines)
+
+
+async def test_completed_filter(client, auth, project_id, deadlines):
+    assert await _titles(client, auth, project_id, completed="true") == {"past_completed", "no_deadline_completed"}
+    assert await _titles(client, auth, project_id, completed="false") == {"overdue", "upcoming", "no_deadline"}
+    assert await _titles(client, auth, project_id, completed="false", overdue="false") == {"upcoming", "no_deadline"}
+
+
+async def test_overdue_uses_the_open_tasks_index(many_tasks, explain):
+    project_id, user_id = many_tasks
+    stmt = _owned_tasks_stmt(project_id, user_id, *_filter_conditions(TaskFilters(overdue=True)))
+    plan = await explain(stmt.order_by(Task.id).limit(101))
+    assert "ix_tasks_open_project_id_deadline" in plan, plan
+
+
+async def test_not_overdue_keeps_the_index_order(many_tasks, explain):
+    project_id, user_id = many_tasks
+    stmt = _owned_tasks_stmt(project_id, user_id, *_filter_conditions(TaskFilters(overdue=False)))
+    plan = await explain(stmt.order_by(Task.deadline.asc().nulls_last(), Task.id).limit(101))
+    assert "ix_tasks_project_id_deadline_id" in plan, plan
+    assert "Seq Scan on tasks" not in plan and "Sort" not in plan, plan
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from app.api.api_v1.crud.task_import import MAX_LINE_LENGTH, _lines
+
+
+async def _stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(*chunks: bytes) -> list:
+    return [line async for line in _lines(_stream(*chunks))]
+
+
+async def test_lines_split_across_chunks():
+    assert await _collect(b"one\ntw", b"o\n", b"thr", "ée".encode()[:-1], "ée".encode()[-1:]) == ["one", "two", "thrée"]
+
+
+async def test_overlong_line_is_reported_once_and_skipped():
+    long_line = b"x" * (MAX_LINE_LENGTH + 1)
+    # the oversized line arrives over several chunks, with no newline for a while
+    chunks = [b"first\n", *(long_line[i:i + 4096] for i in range(0, len(long_line), 4096)), b"\nlast"]
+    assert await _collect(*chunks) == ["first", None, "last"]
+    assert await _collect(b"first\n" + long_line + b"\nlast\n") == ["first", None, "last"]
+    assert await _collect(long_line) == [None]
+
+
+@pytest.mark.postgres
+async def test_oversized_values_are_row_errors(client, auth, project_id):
+    rows = [
+        {"title": "ok"},
+        {"title": "t" * 101},
+        {"title": "ok", "description": "d" * 251},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n" + "x" * (MAX_LINE_LENGTH + 1) + "\n"
+    response = await client.post(f"/projects/{project_id}/tasks:import", content=body, headers=auth)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (1, 3)
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+
+
+@pytest.mark.postgres
+async def test_oversized_title_is_a_validation_error(client, auth, project_id):
+    api = f"/projects/{project_id}/tasks"
+    response = await client.post(api, json={"title": "t" * 101}, headers=auth)
+    assert response.status_code == 422
+    task_id = (await client.post(api, json={"title": "t" * 100}, headers=auth)).json()["id"]
+    response = await client.patch(f"{api}/{task_id}", json={"description": "d" * 251}, headers=auth)
+    assert response.status_code == 422
@@ -0,0 +1,82 @@
+"""Listing queries walk a `(project_id, <sort>, id)` index: no Seq Scan on tasks and no Sort.
+
+Plans come from the `many_tasks` dataset (20 projects x 500 tasks, analyzed),
+for the first page and for a page after a cursor. A cursor page must have
+its keyset comparison in the Index Cond, so the scan starts at the cursor
+instead of filtering the project's earlier tasks.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sqlalchemy import text
+
+from app.api.api_v1.crud.tasks import _keyset_condition, _order_tasks, _owned_tasks_stmt
+from app.models import Task
+
+pytestmark = pytest.mark.postgres
+
+PAGE = 101  # limit + 1, as get_project_tasks_page asks for
+NOW = datetime.now(timezone.utc)
+
+SORT_INDEXES = {
+    "id": "ix_tasks_project_id_id",
+    "deadline": "ix_tasks_project_id_deadline_id",
+    "created_at": "ix_tasks_project_id_created_at_id",
+    "priority": "ix_tasks_project_id_priority_rank_id",
+}
+CURSOR_VALUES = {
+    "id": None,
+    "deadline": NOW + timedelta(days=5),
+    "created_at": NOW - timedelta(hours=2),
+    "priority": 1,
+}
+
+
+@pytest.fixture(autouse=True)
+async def cached_pages(many_tasks, session):
+    # the whole table is in shared buffers, as a project's hot pages are in production;
+    # with the default cost of a random read a 10k-row table is cheaper to sort than to walk
+    await session.execute(text("SET LOCAL random_page_cost = 1.1"))
+
+
+def _assert_index_order(plan: str, index: str, index_cond: str | None = None) -> None:
+    assert index in plan, plan
+    assert "Seq Scan on tasks" not in plan, plan
+    assert "Sort" not in plan, plan
+    if index_cond is not None:
+        assert any("Index Cond" in line and index_cond in line for line in plan.splitlines()), plan
+
+
+@pytest.mark.parametrize("sort", SORT_INDEXES)
+async def test_first_page_reads_the_sort_index(many_tasks, explain, sort):
+    project_id, user_id = many_tasks
+    stmt = _order_tasks(_owned_tasks_stmt(project_id, user_id, columns=True), sort)
+    _assert_index_order(await explain(stmt.limit(PAGE)), SORT_INDEXES[sort])
+
+
+@pytest.mark.parametrize("sort", SORT_INDEXES)
+async def test_cursor_page_reads_the_sort_index(many_tasks, explain, sort):
+    project_id, user_id = many_tasks
+    condition = _keyset_condition(sort, CURSOR_VALUES[sort], 1000)
+    stmt = _order_tasks(_owned_tasks_stmt(project_id, user_id, condition, columns=True), sort)
+    _assert_index_order(await explain(stmt.limit(PAGE)), SORT_INDEXES[sort], "id > 1000" if sort == "id" else "ROW(")
+
+
+@pytest.mark.parametrize(
+    "condition",
+    # a cursor among them, and the follow-up read of a page that reaches them
+    [_keyset_condition("deadline", None, 1000), Task.deadline.is_(None)],
+    ids=["cursor", "follow-up"],
+)
+async def test_tasks_without_deadline_read_the_deadline_index(many_tasks, explain, condition):
+    project_id, user_id = many_tasks
+    stmt = _order_tasks(_owned_tasks_stmt(project_id, user_id, condition, columns=True), "deadline")
+    # fewer than the project's 100 such tasks: a page that takes them all is cheaper to sort
+    _assert_index_order(await explain(stmt.limit(21)), SORT_INDEXES["deadline"], "deadline IS NULL")
+
+
+async def test_unpaginated_listing_reads_the_id_index(many_tasks, explain):
+    project_id, user_id = many_tasks
+    stmt = _owned_tasks_stmt(project_id, user_id, columns=True).order_by(Task.id)
+    _assert_index_order(await explain(stmt), SORT_INDEXES["id"])
@@ -0,0 +1,71 @@
+"""Database round trips per task endpoint.
+
+Stateless auth caches the user after the first request (the `auth` fixture
+makes it while creating the project), so it adds no query here.
+"""
+import pytest
+
+pytestmark = pytest.mark.postgres
+
+
+async def _count(queries, request) -> tuple[int, list[str]]:
+    queries.clear()
+    response = await request
+    assert response.status_code < 500, response.text
+    return response.status_code, list(queries)
+
+
+async def test_listing_is_version_plus_one_query(client, auth, project_id, queries):
+    api = f"/projects/{project_id}/tasks"
+    await client.post(api, json={"title": "first"}, headers=auth)
+
+    for params in ({}, {"paginate": "false"}, {"sort": "deadline", "status": "pending"}):
+        status, statements = await _count(queries, client.get(api, params=params, headers=auth))
+        assert status == 200
+        assert len(statements) == 2, statements
+        # ownership is an uncorrelated EXISTS, not a join the index order would have to survive
+        assert "JOIN" not in statements[1]
+        assert "EXISTS" in statements[1]
+
+
+async def test_empty_page_checks_ownership_separately(client, auth, project_id, queries):
+    status, statements = await _count(queries, client.get(f"/projects/{project_id}/tasks", headers=auth))
+    assert status == 200
+    assert len(statements) == 3, statements
+
+
+async def test_foreign_project_stops_at_version_lookup(client, register, project_id, queries):
+    stranger = await register(client, email="stranger@example.com", name="Stranger")
+    await client.get("/projects", headers=stranger)
+    status, statements = await _count(queries, client.get(f"/projects/{project_id}/tasks", headers=stranger))
+    assert status == 404
+    assert len(statements) == 1, statements
+
+
+async def test_writes_are_single_statements(client, auth, project_id, queries):
+    api = f"/projects/{project_id}/tasks"
+    status, statements = await _count(queries, client.post(api, json={"title": "task"}, headers=auth))
+    assert status == 200
+    assert len(statements) == 1, statements
+    task_id = (await client.get(api, headers=auth)).json()["items"][0]["id"]
+
+    status, statements = await _count(queries, client.patch(f"{api}/{task_id}", json={"status": "completed"}, headers=auth))
+    assert status == 200
+    assert len(statements) == 1, statements
+
+    status, statements = await _count(queries, client.delete(f"{api}/{task_id}", headers=auth))
+    assert status == 200
+    assert len(statements) == 1, statements
+
+    # a miss is followed by the ownership lookup that picks the 404 message
+    status, statements = await _count(queries, client.delete(f"{api}/{task_id}", headers=auth))
+    assert status == 404
+    assert len(statements) == 2, statements
+
+
+async def test_batch_query_count(client, auth, project_id, queries):
+    batch = {"create": [{"title": f"task {i}"} for i in range(10)]}
+    status, statements = await _count(queries, client.post(f"/projects/{project_id}/tasks:batch", json=batch, headers=auth))
+    assert status == 200
+    # project check, one multi-row insert, one version bump
+    assert len(statements) == 3, statements
@@ -0,0 +1,43 @@
+from app.auth import user_cache
+from app.auth.user_cache import UserStateCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(user_cache.time, "monotonic", clock)
+    cache = UserStateCache(maxsize=10, ttl=60)
+    cache.set("1", True)
+    clock.now += 59
+    assert cache.get("1") is True
+    clock.now += 2
+    assert cache.get("1") is None
+    assert len(cache._data) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = UserStateCache(maxsize=2, ttl=60)
+    cache.set("1", True)
+    cache.set("2", True)
+    assert cache.get("1") is True  # "2" is now the oldest
+    cache.set("3", True)
+    assert cache.get("2") is None
+    assert cache.get("1") is True
+    assert cache.get("3") is True
+
+
+def test_invalidate_and_revoke():
+    cache = UserStateCache(maxsize=10, ttl=60)
+    cache.set("1", True)
+    cache.invalidate(1)
+    assert cache.get("1") is None
+    cache.set("2", True)
+    cache.revoke(2)
+    assert cache.get("2") is False
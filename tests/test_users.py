@@ -0,0 +1,66 @@
+import pytest
+
+from app.auth.hashing import password_hasher
+from app.auth.user_cache import user_state_cache
+from app.core.config import settings
+
+pytestmark = pytest.mark.postgres
+
+
+async def test_duplicate_email_is_rejected_without_hashing(client, register, monkeypatch):
+    await register(client, email="taken@example.com")
+    hashed = []
+    original = password_hasher.hash
+
+    async def counting_hash(password):
+        hashed.append(password)
+        return await original(password)
+
+    monkeypatch.setattr(password_hasher, "hash", counting_hash)
+    response = await client.post("/users", json={"email": "taken@EXAMPLE.com", "name": "Again", "password": "secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+    assert hashed == []
+
+    response = await client.post("/users", json={"email": "free@example.com", "name": "New", "password": "secret"})
+    assert response.status_code == 200, response.text
+    assert hashed == ["secret"]
+
+
+async def test_deleted_user_is_rejected_before_the_cache_expires(client, register, auth, project_id, monkeypatch):
+    monkeypatch.setattr(settings.auth_jwt, "stateless", True)
+    await client.post(f"/projects/{project_id}/tasks", json={"title": "task"}, headers=auth)
+    user = (await client.get("/auth/users/me", headers=auth)).json()
+    assert user_state_cache.get(str(user["id"])) is True
+
+    response = await client.delete("/users/me", headers=auth)
+    assert response.status_code == 200, response.text
+    assert user_state_cache.get(str(user["id"])) is False
+    assert (await client.get("/auth/users/me", headers=auth)).status_code == 401
+    assert (await client.get("/projects", headers=auth)).status_code == 401
+
+    # the projects and tasks went with the user, and the email is free again
+    again = await register(client)
+    assert (await client.get("/projects", headers=again)).json() == []
+
+
+async def test_update_invalidates_the_cached_user(client, auth, password, monkeypatch):
+    monkeypatch.setattr(settings.auth_jwt, "stateless", True)
+    user = (await client.get("/auth/users/me", headers=auth)).json()
+    assert user_state_cache.get(str(user["id"])) is True
+
+    response = await client.patch("/users/me", json={"name": "Renamed", "password": "changed"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json() == {**user, "name": "Renamed"}
+    assert user_state_cache.get(str(user["id"])) is None
+
+    login = {"email": user["email"], "password": password}
+    assert (await client.post("/auth/login", json=login)).status_code == 401
+    assert (await client.post("/auth/login", json={**login, "password": "changed"})).status_code == 200
+
+
+async def test_update_to_a_taken_email_is_rejected(client, register, auth):
+    await register(client, email="taken@example.com")
+    response = await client.patch("/users/me", json={"email": "taken@example.com"}, headers=auth)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"